@@ -0,0 +1,142 @@
+# Copyright 2025 DeepMind Technologies Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""Optional Numba kernels for per-pose math (quaternions, rigid inverses).
+
+Numba is not a required dependency. When it is missing, HAVE_NUMBA is False and
+callers use the batched NumPy implementations in data_export.colmap_to_ue instead.
+colmap_to_ue imports this module lazily, and only for batches of at least
+_NUMBA_MIN_POSES poses: below that, importing numba and loading the kernels
+costs more than NumPy takes. All kernels write into caller-provided output buffers.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+
+    @njit(cache=True, fastmath=True)
+    def qvec2rotmat(qw, qx, qy, qz, out):
+        """Quaternion (qw, qx, qy, qz) to 3x3 rotation matrix, written into out."""
+        out[0, 0] = 1.0 - 2.0 * qy * qy - 2.0 * qz * qz
+        out[0, 1] = 2.0 * qx * qy - 2.0 * qw * qz
+        out[0, 2] = 2.0 * qz * qx + 2.0 * qw * qy
+        out[1, 0] = 2.0 * qx * qy + 2.0 * qw * qz
+        out[1, 1] = 1.0 - 2.0 * qx * qx - 2.0 * qz * qz
+        out[1, 2] = 2.0 * qy * qz - 2.0 * qw * qx
+        out[2, 0] = 2.0 * qz * qx - 2.0 * qw * qy
+        out[2, 1] = 2.0 * qy * qz + 2.0 * qw * qx
+        out[2, 2] = 1.0 - 2.0 * qx * qx - 2.0 * qy * qy
+
+    @njit(cache=True, fastmath=True)
+    def shepperd_rotmat_to_q(R, out):
+        """3x3 rotation matrix to normalized quaternion (qw >= 0), written into out (4,)."""
+        tr = R[0, 0] + R[1, 1] + R[2, 2]
+        if tr >= R[0, 0] and tr >= R[1, 1] and tr >= R[2, 2]:
+            s = 2.0 * math.sqrt(max(1.0 + tr, 0.0))
+            out[0] = 0.25 * s
+            out[1] = (R[2, 1] - R[1, 2]) / s
+            out[2] = (R[0, 2] - R[2, 0]) / s
+            out[3] = (R[1, 0] - R[0, 1]) / s
+        elif R[0, 0] >= R[1, 1] and R[0, 0] >= R[2, 2]:
+            s = 2.0 * math.sqrt(max(1.0 + R[0, 0] - R[1, 1] - R[2, 2], 0.0))
+            out[0] = (R[2, 1] - R[1, 2]) / s
+            out[1] = 0.25 * s
+            out[2] = (R[0, 1] + R[1, 0]) / s
+            out[3] = (R[0, 2] + R[2, 0]) / s
+        elif R[1, 1] >= R[2, 2]:
+            s = 2.0 * math.sqrt(max(1.0 - R[0, 0] + R[1, 1] - R[2, 2], 0.0))
+            out[0] = (R[0, 2] - R[2, 0]) / s
+            out[1] = (R[0, 1] + R[1, 0]) / s
+            out[2] = 0.25 * s
+            out[3] = (R[1, 2] + R[2, 1]) / s
+        else:
+            s = 2.0 * math.sqrt(max(1.0 - R[0, 0] - R[1, 1] + R[2, 2], 0.0))
+            out[0] = (R[1, 0] - R[0, 1]) / s
+            out[1] = (R[0, 2] + R[2, 0]) / s
+            out[2] = (R[1, 2] + R[2, 1]) / s
+            out[3] = 0.25 * s
+        norm = math.sqrt(out[0] * out[0] + out[1] * out[1] + out[2] * out[2] + out[3] * out[3])
+        if out[0] < 0.0:
+            norm = -norm
+        for k in range(4):
+            out[k] /= norm
+
+    @njit(cache=True, fastmath=True)
+    def invert_se3(M, out):
+        """Inverse of a rigid 4x4 transform [R | t] as [R^T | -R^T t], written into out."""
+        for i in range(3):
+            for j in range(3):
+                out[i, j] = M[j, i]
+            out[i, 3] = -(M[0, i] * M[0, 3] + M[1, i] * M[1, 3] + M[2, i] * M[2, 3])
+            out[3, i] = 0.0
+        out[3, 3] = 1.0
+
+    @njit(cache=True, parallel=True)
+    def batch_c2w_to_qt(cam_c2w, qvecs, tvecs):
+        """(N, 4, 4) camera-to-world to world-to-camera qvecs (N, 4) and tvecs (N, 3)."""
+        for n in prange(cam_c2w.shape[0]):
+            w2c = np.empty((4, 4))
+            invert_se3(cam_c2w[n], w2c)
+            shepperd_rotmat_to_q(w2c[:3, :3], qvecs[n])
+            for i in range(3):
+                tvecs[n, i] = w2c[i, 3]
+
+    @njit(cache=True, fastmath=True)
+    def euler_xyz(R, out):
+        """3x3 rotation matrix to Euler XYZ (radians), written into out (3,)."""
+        sy = math.sqrt(R[0, 0] * R[0, 0] + R[1, 0] * R[1, 0])
+        if sy > 1e-6:
+            out[0] = math.atan2(R[2, 1], R[2, 2])
+            out[1] = math.atan2(-R[2, 0], sy)
+            out[2] = math.atan2(R[1, 0], R[0, 0])
+        else:
+            out[0] = math.atan2(-R[1, 2], R[1, 1])
+            out[1] = math.atan2(-R[2, 0], sy)
+            out[2] = 0.0
+
+    @njit(cache=True, parallel=True)
+    def batch_euler_xyz(R, out):
+        """(N, 3, 3) rotation matrices to (N, 3) Euler XYZ (radians)."""
+        for n in prange(R.shape[0]):
+            euler_xyz(R[n], out[n])
+
+    @njit(cache=True, parallel=True)
+    def batch_colmap_to_ue(qvecs, tvecs, perm, sign, scale, pos_out, rot_out):
+        """COLMAP world-to-camera (N, 4) qvecs / (N, 3) tvecs to camera-to-world in UE axes.
+
+        The axis change is the signed permutation (perm, sign): P_ue = M @ P and
+        R_ue = M @ R @ M.T with M[i, perm[i]] = sign[i]. Positions are multiplied by scale.
+        """
+        for n in prange(qvecs.shape[0]):
+            R_w2c = np.empty((3, 3))
+            qvec2rotmat(qvecs[n, 0], qvecs[n, 1], qvecs[n, 2], qvecs[n, 3], R_w2c)
+            for i in range(3):
+                pi = perm[i]
+                # Camera center C = -R_w2c^T t; R_c2w = R_w2c^T
+                c = -(R_w2c[0, pi] * tvecs[n, 0] + R_w2c[1, pi] * tvecs[n, 1] + R_w2c[2, pi] * tvecs[n, 2])
+                pos_out[n, i] = sign[i] * c * scale
+                for j in range(3):
+                    rot_out[n, i, j] = sign[i] * sign[j] * R_w2c[perm[j], pi]
@@ -23,7 +23,10 @@ Poses are converted to UE5 camera-to-world: position and rotation matrix.
 
 from __future__ import annotations
 
-import csv
+import functools
+import itertools
+import math
+import warnings
 from pathlib import Path
 from typing import Iterator
 
@@ -31,12 +34,39 @@ import numpy as np
 
 
 # COLMAP → UE5 axis remap: UE forward = Colmap Z, UE right = Colmap X, UE up = -Colmap Y
-# So P_ue = M @ P_colmap with rows = UE X,Y,Z in Colmap components:
-_COLMAP_TO_UE_AXIS = np.array([
-    [0.0, 0.0, 1.0],   # UE X (forward)  = Colmap Z
-    [1.0, 0.0, 0.0],   # UE Y (right)    = Colmap X
-    [0.0, -1.0, 0.0],  # UE Z (up)        = -Colmap Y
-], dtype=np.float64)
+# Stored as a signed permutation: UE axis i = _COLMAP_TO_UE_SIGN[i] * Colmap axis _COLMAP_TO_UE_PERM[i]
+_COLMAP_TO_UE_PERM = np.array([2, 0, 1])
+_COLMAP_TO_UE_SIGN = np.array([1.0, 1.0, -1.0])
+# Equivalent matrix M (P_ue = M @ P_colmap), rows = UE X,Y,Z in Colmap components:
+#   [[0, 0, 1], [1, 0, 0], [0, -1, 0]]
+_COLMAP_TO_UE_AXIS = _COLMAP_TO_UE_SIGN[:, None] * np.eye(3)[_COLMAP_TO_UE_PERM]
+
+# Contraction path for batched (N, 3, 3) x (N, 3) products, searched once instead of per call
+_BATCH_MATVEC_PATH = np.einsum_path(
+    "nij,nj->ni", np.empty((2, 3, 3)), np.empty((2, 3)), optimize="optimal"
+)[0]
+
+# rotmats2qvecs: row k lists the `terms` indices forming 4*q_k*(qw, qx, qy, qz)
+_SHEPPERD_TERMS = np.array([[0, 4, 5, 6], [4, 1, 7, 8], [5, 7, 2, 9], [6, 8, 9, 3]])
+
+# Smallest batch worth the Numba path: importing numba and loading the cached kernels costs
+# ~0.4 s per process, which batched NumPy only loses at around 750k poses
+_NUMBA_MIN_POSES = 750_000
+
+# Column layout of poses CSV files (see export_csv.export_droid_to_csv)
+POSE_CSV_COLUMNS = ("frame_id", "qw", "qx", "qy", "qz", "tx", "ty", "tz")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_kernels():
+    """Import data_export._kernels (and numba) on first use; None if numba is not installed."""
+    from data_export import _kernels
+    return _kernels if _kernels.HAVE_NUMBA else None
+
+
+def _numba_kernels(n: int):
+    """data_export._kernels if numba is installed and n poses reach _NUMBA_MIN_POSES, else None."""
+    return _load_kernels() if n >= _NUMBA_MIN_POSES else None
 
 
 def qvec2rotmat(qvec: np.ndarray) -> np.ndarray:
@@ -61,8 +91,54 @@ def qvec2rotmat(qvec: np.ndarray) -> np.ndarray:
     ], dtype=np.float64)
 
 
-def rotmat2qvec(R: np.ndarray) -> np.ndarray:
-    """Rotation matrix to quaternion (COLMAP order: qw, qx, qy, qz)."""
+def qvecs2rotmats(Q: np.ndarray) -> np.ndarray:
+    """Batched qvec2rotmat: (N, 4) quaternions (qw, qx, qy, qz) to (N, 3, 3) rotation matrices."""
+    Q = np.asarray(Q, dtype=np.float64).reshape(-1, 4)
+    qw, qx, qy, qz = Q[:, 0], Q[:, 1], Q[:, 2], Q[:, 3]
+    xx, yy, zz = 2 * qx * qx, 2 * qy * qy, 2 * qz * qz
+    xy, zx, yz = 2 * qx * qy, 2 * qz * qx, 2 * qy * qz
+    wx, wy, wz = 2 * qw * qx, 2 * qw * qy, 2 * qw * qz
+    return np.stack([
+        1 - yy - zz, xy - wz, zx + wy,
+        xy + wz, 1 - xx - zz, yz - wx,
+        zx - wy, yz + wx, 1 - xx - yy,
+    ], axis=-1).reshape(-1, 3, 3)
+
+
+def rotmat2qvec(R: np.ndarray, _robust: bool = False) -> np.ndarray:
+    """Rotation matrix to quaternion (COLMAP order: qw, qx, qy, qz), with qw >= 0.
+
+    Uses Shepperd's method: pivots on the largest of qw, qx, qy, qz so that 180-degree
+    rotations (qw = 0) keep the relative signs of qx, qy, qz. Pass _robust=True for
+    noisy or degenerate inputs to fit the nearest quaternion with an eigendecomposition.
+    """
+    if _robust:
+        return _rotmat2qvec_eigh(R)
+    R = np.asarray(R, dtype=np.float64)
+    r00, r01, r02 = float(R[0, 0]), float(R[0, 1]), float(R[0, 2])
+    r10, r11, r12 = float(R[1, 0]), float(R[1, 1]), float(R[1, 2])
+    r20, r21, r22 = float(R[2, 0]), float(R[2, 1]), float(R[2, 2])
+    tr = r00 + r11 + r22
+    if tr >= r00 and tr >= r11 and tr >= r22:
+        s = 2.0 * math.sqrt(max(1.0 + tr, 0.0))
+        qvec = np.array([0.25 * s, (r21 - r12) / s, (r02 - r20) / s, (r10 - r01) / s])
+    elif r00 >= r11 and r00 >= r22:
+        s = 2.0 * math.sqrt(max(1.0 + r00 - r11 - r22, 0.0))
+        qvec = np.array([(r21 - r12) / s, 0.25 * s, (r01 + r10) / s, (r02 + r20) / s])
+    elif r11 >= r22:
+        s = 2.0 * math.sqrt(max(1.0 - r00 + r11 - r22, 0.0))
+        qvec = np.array([(r02 - r20) / s, (r01 + r10) / s, 0.25 * s, (r12 + r21) / s])
+    else:
+        s = 2.0 * math.sqrt(max(1.0 - r00 - r11 + r22, 0.0))
+        qvec = np.array([(r10 - r01) / s, (r02 + r20) / s, (r12 + r21) / s, 0.25 * s])
+    qvec /= np.linalg.norm(qvec)
+    if qvec[0] < 0:
+        qvec *= -1
+    return qvec
+
+
+def _rotmat2qvec_eigh(R: np.ndarray) -> np.ndarray:
+    """Eigendecomposition-based rotmat2qvec; tolerates matrices that are not exactly orthonormal."""
     Rxx, Ryx, Rzx, Rxy, Ryy, Rzy, Rxz, Ryz, Rzz = R.flat
     K = (
         np.array([
@@ -80,6 +156,62 @@ def rotmat2qvec(R: np.ndarray) -> np.ndarray:
     return qvec
 
 
+def rotmats2qvecs(R: np.ndarray) -> np.ndarray:
+    """Batched rotmat2qvec: (N, 3, 3) rotation matrices to (N, 4) quaternions (qw, qx, qy, qz).
+
+    Uses Shepperd's method without branches: the four candidates 4*q_k*q (one per
+    choice of pivot q_k) share ten distinct terms, and each matrix gathers the
+    candidate with the largest pivot, which keeps it well-conditioned. Quaternions
+    are normalized and returned with qw >= 0.
+    """
+    R = np.asarray(R, dtype=np.float64).reshape(-1, 3, 3)
+    Rxx, Rxy, Rxz = R[:, 0, 0], R[:, 0, 1], R[:, 0, 2]
+    Ryx, Ryy, Ryz = R[:, 1, 0], R[:, 1, 1], R[:, 1, 2]
+    Rzx, Rzy, Rzz = R[:, 2, 0], R[:, 2, 1], R[:, 2, 2]
+    # 4*qw^2, 4*qx^2, 4*qy^2, 4*qz^2, then 4*qw*qx, 4*qw*qy, 4*qw*qz, 4*qx*qy, 4*qx*qz, 4*qy*qz
+    terms = np.stack([
+        1.0 + Rxx + Ryy + Rzz, 1.0 + Rxx - Ryy - Rzz, 1.0 - Rxx + Ryy - Rzz, 1.0 - Rxx - Ryy + Rzz,
+        Rzy - Ryz, Rxz - Rzx, Ryx - Rxy, Rxy + Ryx, Rxz + Rzx, Ryz + Rzy,
+    ], axis=-1)
+    pivot = np.argmax(terms[:, :4], axis=-1)
+    qvecs = np.take_along_axis(terms, _SHEPPERD_TERMS[pivot], axis=1)
+    qvecs /= np.linalg.norm(qvecs, axis=1, keepdims=True)
+    return np.where(qvecs[:, :1] < 0, -qvecs, qvecs)
+
+
+def c2w_to_colmap_poses(cam_c2w: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Convert (N, 4, 4) camera-to-world matrices to COLMAP world-to-camera poses.
+
+    The inverse of a rigid [R | t] is [R^T | -R^T t], so no general matrix inverse is needed.
+    Uses the Numba kernel for large batches when available, else batched NumPy.
+
+    Returns:
+        qvecs: (N, 4) quaternions (qw, qx, qy, qz).
+        tvecs: (N, 3) translations.
+    """
+    cam_c2w = np.ascontiguousarray(cam_c2w, dtype=np.float64).reshape(-1, 4, 4)
+    kernels = _numba_kernels(cam_c2w.shape[0])
+    if kernels is not None:
+        qvecs = np.empty((cam_c2w.shape[0], 4), dtype=np.float64)
+        tvecs = np.empty((cam_c2w.shape[0], 3), dtype=np.float64)
+        kernels.batch_c2w_to_qt(cam_c2w, qvecs, tvecs)
+        return qvecs, tvecs
+    R_w2c = np.swapaxes(cam_c2w[:, :3, :3], 1, 2)
+    tvecs = -np.einsum("nij,nj->ni", R_w2c, cam_c2w[:, :3, 3], optimize=_BATCH_MATVEC_PATH)
+    return rotmats2qvecs(R_w2c), tvecs
+
+
+def _colmap_to_ue_axes(C: np.ndarray, R: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Apply _COLMAP_TO_UE_AXIS (M) as M @ C and M @ R @ M.T to (..., 3) / (..., 3, 3) inputs.
+
+    M is a signed permutation, so both products reduce to a gather plus sign flip.
+    """
+    perm, sign = _COLMAP_TO_UE_PERM, _COLMAP_TO_UE_SIGN
+    C_ue = C[..., perm] * sign
+    R_ue = R[..., perm[:, None], perm[None, :]] * (sign[:, None] * sign[None, :])
+    return C_ue, R_ue
+
+
 def colmap_pose_to_ue(
     qvec: np.ndarray,
     tvec: np.ndarray,
@@ -105,13 +237,48 @@ def colmap_pose_to_ue(
     # Apply axis remap to UE5: for coordinate transform M,
     # position: P_ue = M @ P_colmap
     # rotation: R_ue = M @ R_colmap @ M.T
-    position_ue = _COLMAP_TO_UE_AXIS @ camera_center_colmap
-    rotation_ue = _COLMAP_TO_UE_AXIS @ R_c2w_colmap @ _COLMAP_TO_UE_AXIS.T
+    position_ue, rotation_ue = _colmap_to_ue_axes(camera_center_colmap, R_c2w_colmap)
     if scale_to_cm:
         position_ue = position_ue * 100.0
     return position_ue, rotation_ue
 
 
+def colmap_poses_to_ue(
+    qvecs: np.ndarray,
+    tvecs: np.ndarray,
+    scale_to_cm: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Batched colmap_pose_to_ue over N poses (Numba kernel for large N when available, else NumPy).
+
+    Args:
+        qvecs: (N, 4) quaternions (qw, qx, qy, qz) world-to-camera.
+        tvecs: (N, 3) translations world-to-camera.
+        scale_to_cm: If True, scale positions to centimeters (UE default).
+
+    Returns:
+        positions_ue: (N, 3) camera positions in UE5 world.
+        rotations_ue: (N, 3, 3) camera-to-world rotation matrices in UE5.
+    """
+    qvecs = np.ascontiguousarray(qvecs, dtype=np.float64).reshape(-1, 4)
+    kernels = _numba_kernels(qvecs.shape[0])
+    if kernels is not None:
+        tvecs = np.ascontiguousarray(tvecs, dtype=np.float64).reshape(-1, 3)
+        positions_ue = np.empty((qvecs.shape[0], 3), dtype=np.float64)
+        rotations_ue = np.empty((qvecs.shape[0], 3, 3), dtype=np.float64)
+        kernels.batch_colmap_to_ue(
+            qvecs, tvecs, _COLMAP_TO_UE_PERM, _COLMAP_TO_UE_SIGN,
+            100.0 if scale_to_cm else 1.0, positions_ue, rotations_ue,
+        )
+        return positions_ue, rotations_ue
+    R_c2w_colmap = np.swapaxes(qvecs2rotmats(qvecs), 1, 2)
+    t_w2c = np.asarray(tvecs, dtype=np.float64).reshape(-1, 3)
+    camera_centers_colmap = -np.einsum("nij,nj->ni", R_c2w_colmap, t_w2c, optimize=_BATCH_MATVEC_PATH)
+    positions_ue, rotations_ue = _colmap_to_ue_axes(camera_centers_colmap, R_c2w_colmap)
+    if scale_to_cm:
+        positions_ue = positions_ue * 100.0
+    return positions_ue, rotations_ue
+
+
 def rotation_matrix_to_euler_xyz_rad(R: np.ndarray) -> np.ndarray:
     """Convert 3x3 rotation matrix to Euler XYZ (radians). Used for Blender."""
     sy = np.sqrt(R[0, 0] ** 2 + R[1, 0] ** 2)
@@ -126,24 +293,84 @@ def rotation_matrix_to_euler_xyz_rad(R: np.ndarray) -> np.ndarray:
     return np.array([x, y, z], dtype=np.float64)
 
 
+def rotation_matrices_to_euler_xyz_rad(R: np.ndarray) -> np.ndarray:
+    """Batched rotation_matrix_to_euler_xyz_rad: (N, 3, 3) to (N, 3) Euler XYZ (radians).
+
+    Uses the Numba kernel for large batches when available, else NumPy.
+    """
+    R = np.asarray(R, dtype=np.float64).reshape(-1, 3, 3)
+    kernels = _numba_kernels(R.shape[0])
+    if kernels is not None:
+        out = np.empty((R.shape[0], 3), dtype=np.float64)
+        kernels.batch_euler_xyz(np.ascontiguousarray(R), out)
+        return out
+    sy = np.hypot(R[:, 0, 0], R[:, 1, 0])
+    regular = sy > 1e-6
+    x = np.where(regular, np.arctan2(R[:, 2, 1], R[:, 2, 2]), np.arctan2(-R[:, 1, 2], R[:, 1, 1]))
+    y = np.arctan2(-R[:, 2, 0], sy)
+    z = np.where(regular, np.arctan2(R[:, 1, 0], R[:, 0, 0]), 0.0)
+    return np.stack([x, y, z], axis=-1)
+
+
+def _pose_csv_usecols(header_line: str) -> list[int]:
+    """Column indices of POSE_CSV_COLUMNS in a poses CSV header line."""
+    header = [c.strip() for c in header_line.strip().split(",")]
+    return [header.index(c) for c in POSE_CSV_COLUMNS]
+
+
+def _parse_pose_rows(rows, usecols: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse pose CSV data rows (file object or list of lines) into (frame_ids, qvecs, tvecs)."""
+    with warnings.catch_warnings():
+        # Header-only files: loadtxt warns about empty input, we return (0, ...) arrays
+        warnings.simplefilter("ignore", UserWarning)
+        data = np.loadtxt(rows, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+    data = data.reshape(-1, len(POSE_CSV_COLUMNS))
+    return data[:, 0].astype(np.int64), data[:, 1:5], data[:, 5:8]
+
+
 def load_poses_csv(csv_path: Path) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
     """Load poses from a CSV with columns: frame_id, qw, qx, qy, qz, tx, ty, tz.
 
     Yields:
         (frame_id, qvec, tvec) for each row.
     """
+    for frame_ids, qvecs, tvecs in load_poses_batched(csv_path):
+        yield from zip(frame_ids.tolist(), qvecs, tvecs)
+
+
+def load_poses_batched(
+    csv_path: Path,
+    batch_size: int = 4096,
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Load a poses CSV in batches of up to batch_size rows.
+
+    Yields:
+        (frame_ids (B,), qvecs (B, 4), tvecs (B, 3)) per batch.
+    """
+    csv_path = Path(csv_path)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        usecols = _pose_csv_usecols(f.readline())
+        while True:
+            lines = list(itertools.islice(f, batch_size))
+            if not lines:
+                break
+            frame_ids, qvecs, tvecs = _parse_pose_rows(lines, usecols)
+            if frame_ids.size:
+                yield frame_ids, qvecs, tvecs
+
+
+def load_poses_arrays(csv_path: Path) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load a poses CSV (frame_id, qw, qx, qy, qz, tx, ty, tz) in a single parse.
+
+    Returns:
+        frame_ids: (N,) int64.
+        qvecs: (N, 4) quaternions (qw, qx, qy, qz).
+        tvecs: (N, 3) translations (tx, ty, tz).
+    """
     csv_path = Path(csv_path)
     with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            frame_id = int(row["frame_id"])
-            qvec = np.array([
-                float(row["qw"]), float(row["qx"]), float(row["qy"]), float(row["qz"])
-            ], dtype=np.float64)
-            tvec = np.array([
-                float(row["tx"]), float(row["ty"]), float(row["tz"])
-            ], dtype=np.float64)
-            yield frame_id, qvec, tvec
+        usecols = _pose_csv_usecols(f.readline())
+        return _parse_pose_rows(f, usecols)
 
 
 def export_ue_poses_csv(
@@ -157,14 +384,12 @@ def export_ue_poses_csv(
     Euler angles are in degrees, XYZ order (roll=X, pitch=Y, yaw=Z) in UE convention.
     """
     with open(output_csv_path, "w", newline="", encoding="utf-8") as out:
-        writer = csv.writer(out)
-        writer.writerow(["frame_id", "px", "py", "pz", "roll_deg", "pitch_deg", "yaw_deg"])
-        for frame_id, qvec, tvec in load_poses_csv(poses_csv_path):
-            pos_ue, R_ue = colmap_pose_to_ue(qvec, tvec, scale_to_cm=scale_to_cm)
-            euler_rad = rotation_matrix_to_euler_xyz_rad(R_ue)
-            euler_deg = np.degrees(euler_rad)
-            writer.writerow([
-                frame_id,
-                f"{pos_ue[0]:.6f}", f"{pos_ue[1]:.6f}", f"{pos_ue[2]:.6f}",
-                f"{euler_deg[0]:.6f}", f"{euler_deg[1]:.6f}", f"{euler_deg[2]:.6f}",
-            ])
+        out.write("frame_id,px,py,pz,roll_deg,pitch_deg,yaw_deg\n")
+        for frame_ids, qvecs, tvecs in load_poses_batched(poses_csv_path):
+            positions_ue, rotations_ue = colmap_poses_to_ue(qvecs, tvecs, scale_to_cm=scale_to_cm)
+            euler_deg = np.degrees(rotation_matrices_to_euler_xyz_rad(rotations_ue))
+            np.savetxt(
+                out,
+                np.column_stack([frame_ids, positions_ue, euler_deg]),
+                fmt="%d,%.6f,%.6f,%.6f,%.6f,%.6f,%.6f",
+            )
@@ -10,7 +10,10 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -20,28 +23,10 @@ _REPO_ROOT = _SCRIPT_DIR.parent
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from data_export.colmap_to_ue import c2w_to_colmap_poses
 from data_export.load_npz_utils import load_droid_npz
 
 
-def rotmat2qvec(R: np.ndarray) -> np.ndarray:
-    """Rotation matrix to quaternion (COLMAP: qw, qx, qy, qz)."""
-    Rxx, Ryx, Rzx, Rxy, Ryy, Rzy, Rxz, Ryz, Rzz = R.flat
-    K = (
-        np.array([
-            [Rxx - Ryy - Rzz, 0, 0, 0],
-            [Ryx + Rxy, Ryy - Rxx - Rzz, 0, 0],
-            [Rzx + Rxz, Rzy + Ryz, Rzz - Rxx - Ryy, 0],
-            [Ryz - Rzy, Rzx - Rxz, Rxy - Ryx, Rxx + Ryy + Rzz],
-        ])
-        / 3.0
-    )
-    eigvals, eigvecs = np.linalg.eigh(K)
-    qvec = eigvecs[[3, 0, 1, 2], np.argmax(eigvals)]
-    if qvec[0] < 0:
-        qvec *= -1
-    return qvec
-
-
 def write_colmap_cameras(
     path: Path,
     camera_id: int,
@@ -64,8 +49,8 @@ def write_colmap_cameras(
 def write_colmap_images(
     path: Path,
     image_names: list[str],
-    qvecs: list[np.ndarray],
-    tvecs: list[np.ndarray],
+    qvecs: np.ndarray | list[np.ndarray],
+    tvecs: np.ndarray | list[np.ndarray],
     camera_id: int = 1,
 ) -> None:
     """
@@ -79,31 +64,55 @@ def write_colmap_images(
         f.write("#   IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID, NAME\n")
         f.write("#   POINTS2D[] as (X, Y, POINT3D_ID)\n")
         f.write(f"# Number of images: {len(image_names)}\n")
-        for i, (name, qvec, tvec) in enumerate(zip(image_names, qvecs, tvecs)):
-            image_id = i + 1
-            f.write(
-                f"{image_id} {qvec[0]:.8f} {qvec[1]:.8f} {qvec[2]:.8f} {qvec[3]:.8f} "
-                f"{tvec[0]:.8f} {tvec[1]:.8f} {tvec[2]:.8f} {camera_id} {name}\n"
-            )
-            # No 2D observations: empty second line (COLMAP allows this)
-            f.write("\n")
+        n = len(image_names)
+        poses = np.column_stack([
+            np.arange(1, n + 1),
+            np.asarray(qvecs, dtype=np.float64).reshape(-1, 4)[:n],
+            np.asarray(tvecs, dtype=np.float64).reshape(-1, 3)[:n],
+        ])
+        pose_fmt = "%d %.8f %.8f %.8f %.8f %.8f %.8f %.8f"
+        # No 2D observations: empty second line (COLMAP allows this)
+        f.write("".join(
+            f"{pose_fmt % tuple(row)} {camera_id} {name}\n\n"
+            for row, name in zip(poses.tolist(), image_names)
+        ))
 
 
-def write_images_to_dir(images: np.ndarray, out_dir: Path, name_fmt: str = "frame_{:06d}.jpg") -> list[str]:
-    """Write (N,H,W,3) uint8 RGB to disk. Returns list of image names."""
+def write_images_to_dir(
+    images: np.ndarray,
+    out_dir: Path,
+    name_fmt: str = "frame_{:06d}.jpg",
+    max_workers: int | None = None,
+) -> list[str]:
+    """Write (N,H,W,3) uint8 RGB to disk. Returns list of image names.
+
+    Frames are encoded on a thread pool (OpenCV releases the GIL while encoding);
+    max_workers defaults to the CPU count.
+    """
     try:
         import cv2
     except ImportError:
         raise ImportError("OpenCV (cv2) is required to write images. Install with: pip install opencv-python")
     out_dir.mkdir(parents=True, exist_ok=True)
-    names = []
-    for i in range(images.shape[0]):
-        name = name_fmt.format(i)
-        p = out_dir / name
+    names = [name_fmt.format(i) for i in range(images.shape[0])]
+
+    # One reusable BGR buffer per worker thread
+    local = threading.local()
+
+    def _write(i: int) -> None:
+        bgr = getattr(local, "bgr", None)
+        if bgr is None:
+            bgr = local.bgr = np.empty(images.shape[1:], dtype=images.dtype)
         # COLMAP expects BGR for JPEG; our arrays are RGB
-        bgr = images[i][:, :, ::-1].copy()
-        cv2.imwrite(str(p), bgr)
-        names.append(name)
+        cv2.cvtColor(images[i], cv2.COLOR_RGB2BGR, dst=bgr)
+        # Encode in memory, then write the file in one call
+        ok, buf = cv2.imencode(Path(names[i]).suffix, bgr)
+        if not ok:
+            raise RuntimeError(f"Failed to encode frame {i} as {names[i]}")
+        (out_dir / names[i]).write_bytes(buf)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        list(pool.map(_write, range(images.shape[0])))
     return names
 
 
@@ -150,14 +159,7 @@ def export_droid_to_colmap(
         image_names = [f"frame_{i:06d}.jpg" for i in range(n)]
 
     # World-to-camera pose per frame
-    qvecs = []
-    tvecs = []
-    for i in range(n):
-        w2c = np.linalg.inv(cam_c2w[i])
-        R = w2c[:3, :3]
-        t = w2c[:3, 3]
-        qvecs.append(rotmat2qvec(R))
-        tvecs.append(t)
+    qvecs, tvecs = c2w_to_colmap_poses(cam_c2w)
 
     images_path = out_dir / "images.txt"
     write_colmap_images(images_path, image_names, qvecs, tvecs, camera_id=1)
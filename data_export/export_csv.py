@@ -7,7 +7,6 @@
 from __future__ import annotations
 
 import argparse
-import csv
 from pathlib import Path
 import sys
 
@@ -19,7 +18,9 @@ _REPO_ROOT = _SCRIPT_DIR.parent
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from data_export.colmap_to_ue import c2w_to_colmap_poses
 from data_export.load_npz_utils import (
+    UniDepthFrame,
     infer_npz_format,
     load_droid_npz,
     load_unidepth_npz,
@@ -28,23 +29,79 @@ from data_export.load_npz_utils import (
 )
 
 
-def _rotmat2qvec(R: np.ndarray) -> np.ndarray:
-    """Rotation matrix to quaternion (COLMAP order: qw, qx, qy, qz)."""
-    Rxx, Ryx, Rzx, Rxy, Ryy, Rzy, Rxz, Ryz, Rzz = R.flat
-    K = (
-        np.array([
-            [Rxx - Ryy - Rzz, 0, 0, 0],
-            [Ryx + Rxy, Ryy - Rxx - Rzz, 0, 0],
-            [Rzx + Rxz, Rzy + Ryz, Rzz - Rxx - Ryy, 0],
-            [Ryz - Rzy, Rzx - Rxz, Rxy - Ryx, Rxx + Ryy + Rzz],
-        ])
-        / 3.0
+# Frames per block when reducing depth stacks, bounding temporaries to ~chunk * H * W
+_DEPTH_SUMMARY_CHUNK = 32
+
+
+def _depth_summary_stats(depths: np.ndarray, chunk_size: int = _DEPTH_SUMMARY_CHUNK) -> np.ndarray:
+    """Per-frame (min, max, mean, median) over valid (finite, > 0) pixels of (N, H, W) depths.
+
+    Frames are reduced chunk_size at a time, so a memory-mapped stack is only paged in
+    block by block. Reductions run in float32 (depth maps are stored as float32), which
+    halves the bytes scanned; only the final (N, 4) result is float64. Frames without valid
+    pixels get all-zero statistics.
+    """
+    n = depths.shape[0]
+    stats = np.zeros((n, 4), dtype=np.float64)
+    for start in range(0, n, chunk_size):
+        d = np.asarray(depths[start:start + chunk_size]).astype(np.float32, copy=False)
+        d = d.reshape(d.shape[0], -1)
+        # One validity mask per chunk, reused for every statistic
+        valid = (d > 0) & np.isfinite(d)
+        counts = np.count_nonzero(valid, axis=1)
+        nonempty = counts > 0
+        dm = np.where(valid, d, np.float32(np.nan))
+        block = stats[start:start + d.shape[0]]
+        block[:, 0] = np.fmin.reduce(dm, axis=1)
+        block[:, 1] = np.fmax.reduce(dm, axis=1)
+        sums = np.where(valid, d, np.float32(0)).sum(axis=1, dtype=np.float32)
+        block[:, 2] = sums / np.maximum(counts, 1)
+        block[nonempty, 3] = np.nanmedian(dm[nonempty], axis=1, overwrite_input=True)
+        block[~nonempty] = 0.0
+    return stats
+
+
+def _write_flat_depth_csv(
+    out_csv: Path,
+    frame_id: str,
+    depth: np.ndarray,
+    depth_decimals: int,
+) -> None:
+    """Write one row per valid pixel (frame_id, row, col, depth) of a (H, W) depth map."""
+    rows, cols = np.nonzero(np.isfinite(depth) & (depth > 0))
+    np.savetxt(
+        out_csv,
+        np.column_stack([rows, cols, depth[rows, cols]]),
+        fmt=f"{frame_id.replace('%', '%%')},%d,%d,%.{depth_decimals}f",
+        header="frame_id,row,col,depth",
+        comments="",
     )
-    eigvals, eigvecs = np.linalg.eigh(K)
-    qvec = eigvecs[[3, 0, 1, 2], np.argmax(eigvals)]
-    if qvec[0] < 0:
-        qvec *= -1
-    return qvec
+
+
+def _write_unidepth_summary_csv(
+    out_csv: Path,
+    frames: list[UniDepthFrame],
+    depth_decimals: int,
+) -> None:
+    """Write one summary row per UniDepth frame (frame_id, fov, height, width, depth stats)."""
+    depths = [fr.depth for fr in frames]
+    # Stack _DEPTH_SUMMARY_CHUNK frames at a time, never a copy of the whole scene
+    stats = np.empty((len(depths), 4), dtype=np.float64)
+    for start in range(0, len(depths), _DEPTH_SUMMARY_CHUNK):
+        chunk = depths[start:start + _DEPTH_SUMMARY_CHUNK]
+        if len({d.shape for d in chunk}) == 1:
+            stats[start:start + len(chunk)] = _depth_summary_stats(np.stack(chunk))
+        else:
+            stats[start:start + len(chunk)] = [_depth_summary_stats(d[None])[0] for d in chunk]
+    stats_fmt = ",".join([f"%.{depth_decimals}f"] * 4)
+    lines = ["frame_id,fov,height,width,depth_min,depth_max,depth_mean,depth_median\n"]
+    lines.extend(
+        f"{fr.frame_id},{fr.fov:.6f},{fr.depth.shape[0]},{fr.depth.shape[1]},"
+        + stats_fmt % tuple(frame_stats) + "\n"
+        for fr, frame_stats in zip(frames, stats)
+    )
+    with open(out_csv, "w", newline="") as f:
+        f.write("".join(lines))
 
 
 def export_unidepth_frame_to_csv(
@@ -59,41 +116,10 @@ def export_unidepth_frame_to_csv(
     - If flatten_depth=True: one row per pixel (frame_id, row, col, depth); file can be large.
     """
     frame = load_unidepth_npz(frame_path)
-    depth = frame.depth
-    h, w = depth.shape
-
-    with open(out_csv, "w", newline="") as f:
-        if flatten_depth:
-            writer = csv.writer(f)
-            writer.writerow(["frame_id", "row", "col", "depth"])
-            valid = np.isfinite(depth) & (depth > 0)
-            for row in range(h):
-                for col in range(w):
-                    if valid[row, col]:
-                        writer.writerow([
-                            frame.frame_id,
-                            row,
-                            col,
-                            round(float(depth[row, col]), depth_decimals),
-                        ])
-        else:
-            writer = csv.writer(f)
-            writer.writerow([
-                "frame_id", "fov", "height", "width",
-                "depth_min", "depth_max", "depth_mean", "depth_median",
-            ])
-            valid = np.isfinite(depth) & (depth > 0)
-            d = depth[valid] if np.any(valid) else np.array([0.0])
-            writer.writerow([
-                frame.frame_id,
-                round(frame.fov, 6),
-                h,
-                w,
-                round(float(np.min(d)), depth_decimals),
-                round(float(np.max(d)), depth_decimals),
-                round(float(np.mean(d)), depth_decimals),
-                round(float(np.median(d)), depth_decimals),
-            ])
+    if flatten_depth:
+        _write_flat_depth_csv(out_csv, frame.frame_id, frame.depth, depth_decimals)
+    else:
+        _write_unidepth_summary_csv(out_csv, [frame], depth_decimals)
 
 
 def export_unidepth_scene_to_csv(
@@ -110,38 +136,12 @@ def export_unidepth_scene_to_csv(
     written = []
     # Single summary CSV for the whole scene (one row per frame)
     summary_path = out_dir / "depth_summary.csv"
-    with open(summary_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            "frame_id", "fov", "height", "width",
-            "depth_min", "depth_max", "depth_mean", "depth_median",
-        ])
-        for fr in frames:
-            d = fr.depth
-            valid = np.isfinite(d) & (d > 0)
-            vals = d[valid] if np.any(valid) else np.array([0.0])
-            writer.writerow([
-                fr.frame_id,
-                round(fr.fov, 6),
-                d.shape[0],
-                d.shape[1],
-                round(float(np.min(vals)), depth_decimals),
-                round(float(np.max(vals)), depth_decimals),
-                round(float(np.mean(vals)), depth_decimals),
-                round(float(np.median(vals)), depth_decimals),
-            ])
+    _write_unidepth_summary_csv(summary_path, frames, depth_decimals)
     written.append(summary_path)
     if flatten_depth:
         for fr in frames:
             frame_csv = out_dir / f"depth_{fr.frame_id}.csv"
-            with open(frame_csv, "w", newline="") as f:
-                w = csv.writer(f)
-                w.writerow(["frame_id", "row", "col", "depth"])
-                h, w_h = fr.depth.shape
-                for r in range(h):
-                    for c in range(w_h):
-                        if np.isfinite(fr.depth[r, c]) and fr.depth[r, c] > 0:
-                            w.writerow([fr.frame_id, r, c, round(float(fr.depth[r, c]), depth_decimals)])
+            _write_flat_depth_csv(frame_csv, fr.frame_id, fr.depth, depth_decimals)
             written.append(frame_csv)
     return written
 
@@ -156,7 +156,7 @@ def export_droid_to_csv(
     Export one *_droid.npz to CSV:
     - intrinsics.csv: camera_id, fx, fy, cx, cy (and full 3x3 if needed)
     - poses.csv: frame_id, qw, qx, qy, qz, tx, ty, tz (world-to-camera, COLMAP-style)
-    - depth_summary.csv (optional): frame_id, depth_min, depth_max, depth_mean
+    - depth_summary.csv (optional): frame_id, depth_min, depth_max, depth_mean, depth_median
     """
     scene = load_droid_npz(npz_path)
     out_dir = Path(out_dir)
@@ -166,52 +166,36 @@ def export_droid_to_csv(
     # Intrinsics
     K = scene.intrinsic
     intrinsics_path = out_dir / "intrinsics.csv"
+    fx, fy, cx, cy = (float(v) for v in (K[0, 0], K[1, 1], K[0, 2], K[1, 2]))
     with open(intrinsics_path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["camera_id", "fx", "fy", "cx", "cy"])
-        w.writerow([1, K[0, 0], K[1, 1], K[0, 2], K[1, 2]])
+        f.write(f"camera_id,fx,fy,cx,cy\n1,{fx},{fy},{cx},{cy}\n")
     written.append(intrinsics_path)
 
     # Poses: convert cam_c2w to world-to-camera quat + tvec
     poses_path = out_dir / "poses.csv"
     n = scene.cam_c2w.shape[0]
-    with open(poses_path, "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow(["frame_id", "qw", "qx", "qy", "qz", "tx", "ty", "tz"])
-        for i in range(n):
-            c2w = scene.cam_c2w[i]
-            w2c = np.linalg.inv(c2w)
-            R = w2c[:3, :3]
-            t = w2c[:3, 3]
-            qvec = _rotmat2qvec(R)
-            w.writerow([
-                i,
-                round(qvec[0], 8),
-                round(qvec[1], 8),
-                round(qvec[2], 8),
-                round(qvec[3], 8),
-                round(t[0], 8),
-                round(t[1], 8),
-                round(t[2], 8),
-            ])
+    q_w2c, t_w2c = c2w_to_colmap_poses(scene.cam_c2w)
+    np.savetxt(
+        poses_path,
+        np.column_stack([np.arange(n), q_w2c, t_w2c]),
+        fmt=["%d"] + ["%.8f"] * 7,
+        delimiter=",",
+        header="frame_id,qw,qx,qy,qz,tx,ty,tz",
+        comments="",
+    )
     written.append(poses_path)
 
     if depth_summary and scene.depths is not None:
         depth_path = out_dir / "depth_summary.csv"
-        with open(depth_path, "w", newline="") as f:
-            w = csv.writer(f)
-            w.writerow(["frame_id", "depth_min", "depth_max", "depth_mean", "depth_median"])
-            for i in range(n):
-                d = scene.depths[i]
-                valid = np.isfinite(d) & (d > 0)
-                vals = d[valid] if np.any(valid) else np.array([0.0])
-                w.writerow([
-                    i,
-                    round(float(np.min(vals)), depth_decimals),
-                    round(float(np.max(vals)), depth_decimals),
-                    round(float(np.mean(vals)), depth_decimals),
-                    round(float(np.median(vals)), depth_decimals),
-                ])
+        stats = _depth_summary_stats(scene.depths)
+        np.savetxt(
+            depth_path,
+            np.column_stack([np.arange(n), stats]),
+            fmt=["%d"] + [f"%.{depth_decimals}f"] * 4,
+            delimiter=",",
+            header="frame_id,depth_min,depth_max,depth_mean,depth_median",
+            comments="",
+        )
         written.append(depth_path)
 
     return written
@@ -5,7 +5,12 @@
 
 from __future__ import annotations
 
+import math
 import os
+import struct
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterator
@@ -35,10 +40,144 @@ def load_npz(path: str | Path) -> np.lib.npyio.NpzFile:
     return np.load(path, allow_pickle=False)
 
 
-def infer_npz_format(path: str | Path) -> str | None:
-    """Infer format from file: 'unidepth' | 'droid' | None."""
-    with load_npz(path) as z:
-        keys = set(z.files)
+# Fixed-size part of a zip local file header; name and extra-field lengths are its last 4 bytes
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+# Bytes per readinto call when filling arrays from .npz members
+_READINTO_CHUNK = 1 << 22
+
+
+def _read_npy_header(fp) -> tuple[tuple[int, ...], bool, np.dtype] | None:
+    """Parse an NPY header at the current position of fp: (shape, fortran_order, dtype).
+
+    Returns None for header versions other than 1.0/2.0 and for object dtypes.
+    """
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        header = np.lib.format.read_array_header_1_0(fp)
+    elif version == (2, 0):
+        header = np.lib.format.read_array_header_2_0(fp)
+    else:
+        return None
+    if header[2].hasobject:
+        return None
+    return header
+
+
+def _npz_member_offset(fp, info: zipfile.ZipInfo) -> int:
+    """Byte offset of a stored member's data (its NPY magic) within the archive file fp."""
+    fp.seek(info.header_offset)
+    local_header = fp.read(_ZIP_LOCAL_HEADER_SIZE)
+    name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+    return info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_len + extra_len
+
+
+def _readinto_exact(fp, buf: np.ndarray) -> None:
+    """Fill buf from fp in _READINTO_CHUNK slices.
+
+    Slicing bounds the temporary bytes that streams without a native readinto (the zip
+    stream of compressed members) allocate, so peak memory stays near one copy of the array.
+    """
+    view = memoryview(buf.view(np.uint8))
+    pos = 0
+    while pos < view.nbytes:
+        n = fp.readinto(view[pos:pos + _READINTO_CHUNK])
+        if not n:
+            raise ValueError("Truncated .npy data")
+        pos += n
+
+
+def _load_npy_fast(fp) -> np.ndarray | None:
+    """Read one NPY array from the current position of fp into a preallocated array.
+
+    Returns None if the header is not supported (see _read_npy_header).
+    """
+    header = _read_npy_header(fp)
+    if header is None:
+        return None
+    shape, fortran_order, dtype = header
+    flat = np.empty(math.prod(shape), dtype=dtype)
+    _readinto_exact(fp, flat)
+    return flat.reshape(shape, order="F" if fortran_order else "C")
+
+
+def _fast_read(zf: zipfile.ZipFile, name: str) -> np.ndarray:
+    """Read array `name` from an open .npz ZipFile without the chunked zip-stream reader.
+
+    Stored members are read straight from the archive file after seeking past the local
+    header (no CRC pass); compressed members are read from the zip stream. Either way the
+    payload goes into one preallocated array, with np.lib.format.read_array as fallback
+    for headers _load_npy_fast does not handle.
+    """
+    info = zf.getinfo(name + ".npy")
+    if info.compress_type == zipfile.ZIP_STORED:
+        fp = zf.fp
+        offset = _npz_member_offset(fp, info)
+        fp.seek(offset)
+        arr = _load_npy_fast(fp)
+        if arr is None:
+            fp.seek(offset)
+            arr = np.lib.format.read_array(fp, allow_pickle=False)
+        return arr
+    with zf.open(info) as fp:
+        arr = _load_npy_fast(fp)
+    if arr is None:
+        with zf.open(info) as fp:
+            arr = np.lib.format.read_array(fp, allow_pickle=False)
+    return arr
+
+
+def _memmap_from_npz(
+    path: str | Path, name: str, zf: zipfile.ZipFile | None = None
+) -> np.ndarray | None:
+    """Memory-map array `name` directly inside an uncompressed .npz (np.savez) archive.
+
+    zf may be the archive already opened, to reuse its parsed central directory.
+    Returns None if the member is compressed (np.savez_compressed) or cannot be mapped;
+    callers then fall back to reading it through np.load. The map is copy-on-write, so
+    like a loaded array it can be modified in place (without touching the file).
+    """
+    if zf is None:
+        with zipfile.ZipFile(path) as zf:
+            info = zf.getinfo(name + ".npy")
+    else:
+        info = zf.getinfo(name + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, "rb") as fp:
+        fp.seek(_npz_member_offset(fp, info))
+        header = _read_npy_header(fp)
+        offset = fp.tell()
+    if header is None or 0 in header[0]:
+        return None
+    shape, fortran_order, dtype = header
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="c",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def _load_as(a: np.ndarray, dtype: np.dtype | type, keep_float: bool = False) -> np.ndarray:
+    """Return a as dtype, without a copy when it is already stored as dtype.
+
+    keep_float=True also keeps any stored floating-point dtype (float16/32/64) as is,
+    so only non-float data (e.g. uint16 depth) is cast.
+    """
+    if a.dtype == dtype or (keep_float and a.dtype.kind == "f"):
+        return a
+    return a.astype(dtype)
+
+
+def _npz_keys(zf: zipfile.ZipFile) -> set[str]:
+    """Array names stored in an open .npz archive (member names without ".npy")."""
+    return {name[:-4] for name in zf.namelist() if name.endswith(".npy")}
+
+
+def _npz_format_from_keys(keys: set[str]) -> str | None:
     if "depth" in keys and "fov" in keys and "cam_c2w" not in keys:
         return "unidepth"
     if all(k in keys for k in ("images", "depths", "intrinsic", "cam_c2w")):
@@ -46,6 +185,23 @@ def infer_npz_format(path: str | Path) -> str | None:
     return None
 
 
+def _npz_path(z: np.lib.npyio.NpzFile) -> Path:
+    """File path of an NpzFile; the fast readers need it to read members directly."""
+    if not isinstance(z.zip.filename, str):
+        raise ValueError("NpzFile must have been opened from a file path.")
+    return Path(z.zip.filename)
+
+
+def infer_npz_format(path: str | Path) -> str | None:
+    """Infer format from file: 'unidepth' | 'droid' | None.
+
+    Only the zip central directory is read (no NpzFile, no array data).
+    """
+    with zipfile.ZipFile(path) as zf:
+        keys = _npz_keys(zf)
+    return _npz_format_from_keys(keys)
+
+
 # -----------------------------------------------------------------------------
 # UniDepth (per-frame) data
 # -----------------------------------------------------------------------------
@@ -58,59 +214,154 @@ class UniDepthFrame:
     frame_id: str      # e.g. filename stem "00000"
 
 
-def load_unidepth_npz(path: str | Path) -> UniDepthFrame:
-    """Load one UniDepth per-frame .npz."""
-    path = Path(path)
-    with load_npz(path) as z:
-        depth = np.asarray(z["depth"], dtype=np.float32)
-        fov = float(np.asarray(z["fov"]).flat[0])
+def _load_unidepth_from(zf: zipfile.ZipFile, path: Path) -> UniDepthFrame:
+    depth = _fast_read(zf, "depth")
+    fov = float(_fast_read(zf, "fov").flat[0])
+    depth = _load_as(depth, np.float32)
     return UniDepthFrame(depth=depth, fov=fov, frame_id=path.stem)
 
 
-def load_unidepth_scene(dir_path: str | Path) -> list[UniDepthFrame]:
-    """Load all .npz in a directory (one scene from UniDepth/outputs/<scene>/)."""
+def load_unidepth_npz(path_or_npz: str | Path | np.lib.npyio.NpzFile) -> UniDepthFrame:
+    """Load one UniDepth per-frame .npz, from its path or an already open NpzFile."""
+    if isinstance(path_or_npz, np.lib.npyio.NpzFile):
+        return _load_unidepth_from(path_or_npz.zip, _npz_path(path_or_npz))
+    path = Path(path_or_npz)
+    with zipfile.ZipFile(path) as zf:
+        return _load_unidepth_from(zf, path)
+
+
+def load_unidepth_scene(dir_path: str | Path, max_workers: int | None = None) -> list[UniDepthFrame]:
+    """Load all .npz in a directory (one scene from UniDepth/outputs/<scene>/).
+
+    Per-frame loads are I/O-bound and run on a thread pool; max_workers defaults to
+    min(16, 2 * CPU count). Frames are returned in sorted filename order.
+    """
     dir_path = Path(dir_path)
-    frames = []
-    for p in sorted(dir_path.glob("*.npz")):
-        frames.append(load_unidepth_npz(p))
-    return frames
+    paths = sorted(dir_path.glob("*.npz"))
+    if max_workers is None:
+        max_workers = min(16, 2 * (os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(load_unidepth_npz, paths))
 
 
 # -----------------------------------------------------------------------------
 # DROID / camera-tracking (single .npz per scene) data
 # -----------------------------------------------------------------------------
 
-@dataclass
+# Per DROID array: (dtype to return, keep a stored float dtype instead of casting it)
+_DROID_ARRAYS = {
+    "images": (np.uint8, False),
+    # Depths keep their stored float dtype; use DroidScene.depths_as() for a fixed one
+    "depths": (np.float32, True),
+    # Poses and intrinsics too: float32 on disk stays float32 (pose math promotes as needed)
+    "intrinsic": (np.float64, True),
+    "cam_c2w": (np.float64, True),
+}
+
+
+def _read_droid_array(path: Path, key: str) -> np.ndarray:
+    """Memory-map (uncompressed) or read (compressed) one array of a *_droid.npz."""
+    with zipfile.ZipFile(path) as zf:
+        a = _memmap_from_npz(path, key, zf=zf)
+        if a is None:
+            a = _fast_read(zf, key)
+    dtype, keep_float = _DROID_ARRAYS[key]
+    return _load_as(a, dtype, keep_float=keep_float)
+
+
 class DroidScene:
-    """Single scene from evaluate_demo: outputs/<scene>_droid.npz."""
-    images: np.ndarray    # (N, H, W, 3) uint8 RGB
-    depths: np.ndarray    # (N, H, W) float32
-    intrinsic: np.ndarray # (3, 3) K
-    cam_c2w: np.ndarray   # (N, 4, 4) camera-to-world
-    scene_name: str       # e.g. "swing", "breakdance-flare"
+    """Single scene from evaluate_demo: outputs/<scene>_droid.npz.
 
+    Arrays are read from the archive on first access, so code that only needs cam_c2w
+    never reads images or depths; load() reads all of them up front. Arrays of an
+    uncompressed archive are copy-on-write memory maps into the file.
+    """
 
-def load_droid_npz(path: str | Path, scene_name: str | None = None) -> DroidScene:
-    """Load one *_droid.npz file."""
-    path = Path(path)
+    def __init__(self, path: str | Path, scene_name: str) -> None:
+        self.path = Path(path)
+        self.scene_name = scene_name  # e.g. "swing", "breakdance-flare"
+        self._arrays: dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"DroidScene(path={str(self.path)!r}, scene_name={self.scene_name!r})"
+
+    def _get(self, key: str) -> np.ndarray:
+        a = self._arrays.get(key)
+        if a is None:
+            with self._lock:
+                a = self._arrays.get(key)
+                if a is None:
+                    a = self._arrays[key] = _read_droid_array(self.path, key)
+        return a
+
+    @property
+    def images(self) -> np.ndarray:
+        """(N, H, W, 3) uint8 RGB."""
+        return self._get("images")
+
+    @property
+    def depths(self) -> np.ndarray:
+        """(N, H, W) float, as stored (float32, or float16 to halve I/O)."""
+        return self._get("depths")
+
+    @property
+    def intrinsic(self) -> np.ndarray:
+        """(3, 3) K, float32 or float64 as stored."""
+        return self._get("intrinsic")
+
+    @property
+    def cam_c2w(self) -> np.ndarray:
+        """(N, 4, 4) camera-to-world, float32 or float64 as stored."""
+        return self._get("cam_c2w")
+
+    @property
+    def depths_dtype(self) -> np.dtype:
+        """On-disk dtype of depths."""
+        return self.depths.dtype
+
+    def depths_as(self, dtype: np.dtype | type = np.float32) -> np.ndarray:
+        """Depths converted to dtype (no copy if they are already stored as dtype)."""
+        return self.depths.astype(dtype, copy=False)
+
+    def load(self) -> DroidScene:
+        """Read every array now instead of on first access. Returns self."""
+        for key in _DROID_ARRAYS:
+            self._get(key)
+        return self
+
+
+def _check_droid_keys(keys: set[str], path: Path) -> None:
+    missing = [k for k in _DROID_ARRAYS if k not in keys]
+    if missing:
+        raise ValueError(f"Not a DROID .npz (missing {', '.join(missing)}): {path}")
+
+
+def load_droid_npz(
+    path_or_npz: str | Path | np.lib.npyio.NpzFile, scene_name: str | None = None
+) -> DroidScene:
+    """Open one *_droid.npz file, from its path or an already open NpzFile.
+
+    Only the zip central directory is read here; arrays are read lazily (see DroidScene).
+    """
+    if isinstance(path_or_npz, np.lib.npyio.NpzFile):
+        path = _npz_path(path_or_npz)
+        keys = set(path_or_npz.files)
+    else:
+        path = Path(path_or_npz)
+        with zipfile.ZipFile(path) as zf:
+            keys = _npz_keys(zf)
+    _check_droid_keys(keys, path)
     if scene_name is None:
         scene_name = path.stem.replace("_droid", "")
-    with load_npz(path) as z:
-        images = np.asarray(z["images"], dtype=np.uint8)
-        depths = np.asarray(z["depths"], dtype=np.float32)
-        intrinsic = np.asarray(z["intrinsic"], dtype=np.float64)
-        cam_c2w = np.asarray(z["cam_c2w"], dtype=np.float64)
-    return DroidScene(
-        images=images,
-        depths=depths,
-        intrinsic=intrinsic,
-        cam_c2w=cam_c2w,
-        scene_name=scene_name,
-    )
+    return DroidScene(path, scene_name)
 
 
 def iter_droid_npz(dir_path: str | Path) -> Iterator[tuple[str, DroidScene]]:
-    """Yield (scene_name, DroidScene) for every *_droid.npz in directory."""
+    """Yield (scene_name, DroidScene) for every *_droid.npz in directory.
+
+    Scenes are lazy (see DroidScene), so each one only costs a central-directory read here.
+    """
     dir_path = Path(dir_path)
     for p in sorted(dir_path.glob("*_droid.npz")):
         scene_name = p.stem.replace("_droid", "")
@@ -122,12 +373,19 @@ def iter_droid_npz(dir_path: str | Path) -> Iterator[tuple[str, DroidScene]]:
 # -----------------------------------------------------------------------------
 
 def load_any_npz(path: str | Path):
-    """Load .npz and return either UniDepthFrame or DroidScene. Raises if unknown."""
-    fmt = infer_npz_format(path)
-    if fmt == "unidepth":
-        return load_unidepth_npz(path)
+    """Load .npz and return either UniDepthFrame or DroidScene. Raises if unknown.
+
+    The archive is opened once: one central-directory parse serves format detection
+    and loading (no NpzFile is built).
+    """
+    path = Path(path)
+    with zipfile.ZipFile(path) as zf:
+        fmt = _npz_format_from_keys(_npz_keys(zf))
+        if fmt == "unidepth":
+            return _load_unidepth_from(zf, path)
     if fmt == "droid":
-        return load_droid_npz(path)
+        # Format detection already checked the members; arrays are read lazily
+        return DroidScene(path, path.stem.replace("_droid", ""))
     raise ValueError(
         f"Unknown .npz format: {path}. Expected UniDepth (depth, fov) or DROID (images, depths, intrinsic, cam_c2w)."
     )
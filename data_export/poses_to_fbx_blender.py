@@ -19,13 +19,23 @@ Usage (from repo root, with Blender on PATH):
   blender --background --python data_export/poses_to_fbx_blender.py -- \\
     plaza_csv/poses.csv plaza_camera.fbx 30
 
+The poses file may also be a .npy holding an (N, 8) float64 array with the same columns
+(frame_id, qw, qx, qy, qz, tx, ty, tz); run_export_fbx_colmap passes poses this way.
+
+Batch mode exports many CSVs in one Blender session (pays Blender startup once):
+  blender --background --python data_export/poses_to_fbx_blender.py -- \\
+    --manifest jobs.json
+where jobs.json is a list of {"poses_csv": ..., "output_fbx": ..., "fps": 30} ("fps" optional).
+
 Or use run_export_fbx.py which finds Blender and invokes this script.
 """
 
 from __future__ import annotations
 
 import argparse
+import json
 import sys
+import traceback
 from pathlib import Path
 
 # Add repo root so we can import data_export.colmap_to_ue when run by Blender
@@ -44,9 +54,9 @@ except ImportError:
     sys.exit(1)
 
 from data_export.colmap_to_ue import (
-    colmap_pose_to_ue,
-    load_poses_csv,
-    rotation_matrix_to_euler_xyz_rad,
+    colmap_poses_to_ue,
+    load_poses_arrays,
+    rotation_matrices_to_euler_xyz_rad,
 )
 
 
@@ -62,11 +72,13 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument(
         "poses_csv",
         type=Path,
-        help="Path to poses CSV (frame_id, qw, qx, qy, qz, tx, ty, tz).",
+        nargs="?",
+        help="Path to poses CSV (frame_id, qw, qx, qy, qz, tx, ty, tz), or .npy (N, 8) array of the same columns.",
     )
     parser.add_argument(
         "output_fbx",
         type=Path,
+        nargs="?",
         help="Output FBX file path.",
     )
     parser.add_argument(
@@ -76,6 +88,12 @@ def _parse_args() -> argparse.Namespace:
         default=30.0,
         help="Frames per second for timeline (default: 30).",
     )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="JSON list of {poses_csv, output_fbx[, fps]} jobs to export in this one Blender run.",
+    )
     parser.add_argument(
         "--scale-to-cm",
         action="store_true",
@@ -88,13 +106,23 @@ def _parse_args() -> argparse.Namespace:
         dest="scale_to_cm",
         help="Keep positions in meters.",
     )
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if (args.manifest is None) == (args.poses_csv is None or args.output_fbx is None):
+        parser.error("give either poses_csv and output_fbx, or --manifest")
+    return args
 
 
 def _clear_scene() -> None:
-    """Remove default objects so we start clean."""
-    bpy.ops.object.select_all(action="SELECT")
-    bpy.ops.object.delete(use_global=False)
+    """Remove objects, cameras and actions (defaults or a previous export) so we start clean.
+
+    Uses the data API directly: no operator poll/undo overhead.
+    """
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for cam_data in list(bpy.data.cameras):
+        bpy.data.cameras.remove(cam_data)
+    for action in list(bpy.data.actions):
+        bpy.data.actions.remove(action)
 
 
 # Blender camera default: local -Y = forward. UE export: we want that to be UE +X (forward).
@@ -111,73 +139,112 @@ _UE_TO_BLENDER_WORLD = np.array([
     [0.0, 0.0, 1.0],   # Blender Z (up) = UE5 Z (up)
 ], dtype=np.float64)
 
+# CRITICAL: Blender camera convention
+# R_ue is camera-to-world where columns are [forward | right | up] in UE5
+# After the coordinate transform A @ R_ue @ A.T, columns are [right | forward | up] in Blender world
+# BUT: Blender camera's LOCAL axes are [right | up | backward]
+# Blender camera looks along LOCAL -Z, which is the NEGATIVE of the 3rd column
+#
+# We need columns [right | up | -forward]: swap columns 1 and 2 and negate the new column 2,
+# i.e. right-multiply by _CAMERA_AXES_FIX. Both constant factors are fused into one:
+#   R_final = A @ R_ue @ (A.T @ _CAMERA_AXES_FIX) = _A @ R_ue @ _B
+_CAMERA_AXES_FIX = np.array([
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, -1.0],
+    [0.0, 1.0, 0.0],
+], dtype=np.float64)
+# float32: Blender stores transforms in single precision, so the per-pose product can too
+_A = _UE_TO_BLENDER_WORLD.astype(np.float32)
+_B = (_UE_TO_BLENDER_WORLD.T @ _CAMERA_AXES_FIX).astype(np.float32)
+
 
 def _create_camera(name: str = "Camera") -> bpy.types.Object:
     """Create a camera (default Blender orientation: looks along -Y)."""
-    bpy.ops.object.camera_add()
-    cam = bpy.context.active_object
-    cam.name = name
+    cam_data = bpy.data.cameras.new(name)
+    cam = bpy.data.objects.new(name, cam_data)
+    bpy.context.scene.collection.objects.link(cam)
     return cam
 
 
+def _new_action_fcurves(obj: bpy.types.Object):
+    """Assign a new action to obj and return the F-curve collection to key it through.
+
+    Blender 4.4+ uses layered actions: F-curves live in the channelbag of the object's
+    slot (action.fcurves is deprecated there and removed in 5.0). Older versions key
+    action.fcurves directly.
+    """
+    obj.animation_data_create()
+    action = bpy.data.actions.new(name=f"{obj.name}Action")
+    obj.animation_data.action = action
+    if bpy.app.version < (4, 4, 0):
+        return action.fcurves
+    slot = action.slots.new(id_type="OBJECT", name=obj.name)
+    obj.animation_data.action_slot = slot
+    strip = action.layers.new("Layer").strips.new(type="KEYFRAME")
+    return strip.channelbag(slot, ensure=True).fcurves
+
+
+def _add_fcurve_keys(
+    fcurves,
+    data_path: str,
+    frames: np.ndarray,
+    values: np.ndarray,
+) -> None:
+    """Add one F-curve per column of values (N, 3), keyed at frames (N,), in bulk."""
+    co = np.empty((frames.shape[0], 2), dtype=np.float32)
+    co[:, 0] = frames
+    for index in range(values.shape[1]):
+        fcu = fcurves.new(data_path, index=index)
+        fcu.keyframe_points.add(frames.shape[0])
+        co[:, 1] = values[:, index]
+        fcu.keyframe_points.foreach_set("co", co.ravel())
+        fcu.update()
+
+
 def _set_keyframes(
     cam: bpy.types.Object,
-    poses: list[tuple[int, np.ndarray, np.ndarray]],
+    frame_ids: np.ndarray,
+    qvecs: np.ndarray,
+    tvecs: np.ndarray,
     fps: float,
     scale_to_cm: bool,
 ) -> None:
-    """Set camera location and rotation keyframes from COLMAP poses."""
+    """Set camera location and rotation keyframes from COLMAP poses (N,), (N, 4), (N, 3).
+
+    All poses are converted in one batch; keyframes are written straight into the camera
+    action's F-curves (no per-frame frame_set/keyframe_insert, so no depsgraph update per pose).
+    """
     scene = bpy.context.scene
     scene.render.fps = int(round(fps))
-    for frame_id, qvec, tvec in poses:
-        frame = int(frame_id)
-        pos_ue, R_ue = colmap_pose_to_ue(qvec, tvec, scale_to_cm=scale_to_cm)
-        
-        # Transform from UE5 world coordinates to Blender world coordinates
-        # UE5: X=forward, Y=right, Z=up
-        # Blender: X=right, Y=forward, Z=up
-        # Position: simple axis swap
-        pos_blender = np.array([pos_ue[1], pos_ue[0], pos_ue[2]], dtype=np.float64)
-        
-        # Rotation: similarity transformation for coordinate change
-        R_blender = _UE_TO_BLENDER_WORLD @ R_ue @ _UE_TO_BLENDER_WORLD.T
-        
-        # CRITICAL: Blender camera convention
-        # R_ue is camera-to-world where columns are [forward | right | up] in UE5
-        # After coordinate transform, R_blender columns are [right | forward | up] in Blender world
-        # BUT: Blender camera's LOCAL axes are [right | up | backward]
-        # Blender camera looks along LOCAL -Z, which is the NEGATIVE of the 3rd column
-        #
-        # We need R_blender where:
-        #   Column 0 = camera's right in world
-        #   Column 1 = camera's up in world  
-        #   Column 2 = camera's BACKWARD in world (camera looks along -column2)
-        #
-        # Current R_blender = [right | forward | up]
-        # We need:           [right | up | -forward]
-        #
-        # Solution: Swap columns 1 and 2, and negate the new column 2
-        R_blender_corrected = np.column_stack([
-            R_blender[:, 0],   # right stays
-            R_blender[:, 2],   # up (was column 2)
-            -R_blender[:, 1],  # backward = -forward (was column 1)
-        ])
-        R_blender = R_blender_corrected
-        
-        euler_rad = rotation_matrix_to_euler_xyz_rad(R_blender)
-        # Timeline frame: 1-based in Blender UI, we use frame_id + 1 for clarity
-        scene.frame_set(frame + 1)
-        cam.location = (float(pos_blender[0]), float(pos_blender[1]), float(pos_blender[2]))
-        cam.rotation_euler = (float(euler_rad[0]), float(euler_rad[1]), float(euler_rad[2]))
-        cam.keyframe_insert(data_path="location", frame=frame + 1)
-        cam.keyframe_insert(data_path="rotation_euler", frame=frame + 1)
+    pos_ue, R_ue = colmap_poses_to_ue(qvecs, tvecs, scale_to_cm=scale_to_cm)
+
+    # Transform from UE5 world coordinates to Blender world coordinates
+    # UE5: X=forward, Y=right, Z=up
+    # Blender: X=right, Y=forward, Z=up
+    # Position: simple axis swap
+    locations = pos_ue[:, [1, 0, 2]]
+
+    # Rotation: coordinate change plus Blender camera axes, fused (see _A, _B)
+    R_blender = np.einsum("ij,njk,kl->nil", _A, R_ue.astype(np.float32), _B, optimize=True)
+
+    eulers = rotation_matrices_to_euler_xyz_rad(R_blender)
+    # Timeline frame: 1-based in Blender UI, we use frame_id + 1 for clarity
+    frames = np.asarray(frame_ids, dtype=np.float64) + 1.0
+
+    fcurves = _new_action_fcurves(cam)
+    _add_fcurve_keys(fcurves, "location", frames, locations)
+    _add_fcurve_keys(fcurves, "rotation_euler", frames, eulers)
     # Set scene frame range
     scene.frame_start = 1
-    scene.frame_end = len(poses) + 1
+    scene.frame_end = len(frame_ids) + 1
 
 
 def _export_fbx(output_path: Path) -> None:
-    """Export scene to FBX with Unreal-friendly axes (Forward X, Up Z)."""
+    """Export scene to FBX with Unreal-friendly axes (Forward X, Up Z).
+
+    Blender's FBX exporter only writes animation through its bake pass (bake_anim=False
+    drops the camera animation entirely), so baking stays on.
+    """
     output_path = Path(output_path).resolve()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     bpy.ops.export_scene.fbx(
@@ -199,28 +266,72 @@ def _export_fbx(output_path: Path) -> None:
     )
 
 
-def main() -> int:
-    args = _parse_args()
-    poses_csv = Path(args.poses_csv).resolve()
-    output_fbx = Path(args.output_fbx).resolve()
+def _load_jobs(args: argparse.Namespace) -> list[tuple[Path, Path, float]]:
+    """(poses_csv, output_fbx, fps) per export: the manifest entries, or the single CSV."""
+    if args.manifest is None:
+        return [(Path(args.poses_csv).resolve(), Path(args.output_fbx).resolve(), args.fps)]
+    with open(args.manifest, encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        (
+            Path(entry["poses_csv"]).resolve(),
+            Path(entry["output_fbx"]).resolve(),
+            float(entry.get("fps", args.fps)),
+        )
+        for entry in entries
+    ]
+
 
+def _load_poses(poses_path: Path) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(frame_ids, qvecs, tvecs) from a poses CSV or an (N, 8) .npy of the same columns."""
+    if poses_path.suffix.lower() == ".npy":
+        data = np.load(poses_path).reshape(-1, 8)
+        return data[:, 0].astype(np.int64), data[:, 1:5], data[:, 5:8]
+    return load_poses_arrays(poses_path)
+
+
+def _export_one(poses_csv: Path, output_fbx: Path, fps: float, scale_to_cm: bool) -> int:
     if not poses_csv.is_file():
         print(f"Error: poses CSV not found: {poses_csv}")
         return 1
 
-    poses = list(load_poses_csv(poses_csv))
-    if not poses:
-        print("Error: no poses in CSV")
+    frame_ids, qvecs, tvecs = _load_poses(poses_csv)
+    if frame_ids.size == 0:
+        print(f"Error: no poses in CSV: {poses_csv}")
         return 1
 
     _clear_scene()
     cam = _create_camera(name="CineCameraActor")
-    _set_keyframes(cam, poses, args.fps, args.scale_to_cm)
+    _set_keyframes(cam, frame_ids, qvecs, tvecs, fps, scale_to_cm)
     _export_fbx(output_fbx)
 
-    print(f"Exported {len(poses)} camera keyframes to {output_fbx}")
+    print(f"Exported {frame_ids.size} camera keyframes to {output_fbx}")
     return 0
 
 
+def _try_export_one(poses_csv: Path, output_fbx: Path, fps: float, scale_to_cm: bool) -> int:
+    """_export_one, reporting an exception from loading or exporting as a failed job."""
+    try:
+        return _export_one(poses_csv, output_fbx, fps, scale_to_cm)
+    except Exception:
+        traceback.print_exc()
+        print(f"Error: export failed: {poses_csv} -> {output_fbx}")
+        return 1
+
+
+def main() -> int:
+    args = _parse_args()
+    # A single CSV is a one-element batch; keep going past failed jobs, report at the end
+    jobs = _load_jobs(args)
+    failed = [
+        poses_csv
+        for poses_csv, output_fbx, fps in jobs
+        if _try_export_one(poses_csv, output_fbx, fps, args.scale_to_cm) != 0
+    ]
+    if failed and len(jobs) > 1:
+        print(f"Error: {len(failed)} of {len(jobs)} exports failed")
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -21,24 +21,34 @@ Finds Blender (PATH, BLENDER_EXE, or common Windows paths) and runs:
 Usage (from repo root):
   python -m data_export.run_export_fbx plaza_csv/poses.csv plaza_camera.fbx [--fps 30]
   python -m data_export.run_export_fbx plaza_csv/poses.csv plaza_camera.fbx --no-scale-to-cm
+
+Batch: pass a directory of pose CSVs (*.csv and */poses.csv) and an output directory;
+Blender is launched once for all of them:
+  python -m data_export.run_export_fbx csv_exports/ fbx_out/
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
+import json
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
+from data_export.colmap_to_ue import POSE_CSV_COLUMNS
+
 _SCRIPT_DIR = Path(__file__).resolve().parent
 _REPO_ROOT = _SCRIPT_DIR.parent
 _BLENDER_SCRIPT = _SCRIPT_DIR / "poses_to_fbx_blender.py"
 
 
+@functools.lru_cache(maxsize=1)
 def _find_blender() -> str | None:
-    """Return path to Blender executable, or None if not found."""
+    """Return path to Blender executable, or None if not found (looked up once per process)."""
     # 1. Environment variable
     exe = os.environ.get("BLENDER_EXE")
     if exe and Path(exe).is_file():
@@ -52,13 +62,45 @@ def _find_blender() -> str | None:
         program_files = os.environ.get("ProgramFiles", "C:\\Program Files")
         foundation = Path(program_files) / "Blender Foundation"
         if foundation.is_dir():
-            for sub in sorted(foundation.iterdir(), reverse=True):
-                candidate = sub / "blender.exe"
-                if candidate.is_file():
-                    return str(candidate)
+            # DirEntry.is_dir() uses the type from the directory listing, no extra stat
+            subdirs = sorted((e.path for e in os.scandir(foundation) if e.is_dir()), reverse=True)
+            for sub in subdirs:
+                candidate = os.path.join(sub, "blender.exe")
+                if os.path.isfile(candidate):
+                    return candidate
     return None
 
 
+def _is_poses_csv(csv_path: Path) -> bool:
+    """True if the CSV header has every poses column (frame_id, qw, qx, qy, qz, tx, ty, tz)."""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        header = {c.strip() for c in f.readline().strip().split(",")}
+    return header.issuperset(POSE_CSV_COLUMNS)
+
+
+def _collect_batch(csv_dir: Path, out_dir: Path, fps: float) -> list[dict]:
+    """Manifest entries for every poses CSV among *.csv and */poses.csv under csv_dir.
+
+    Other CSVs (intrinsics.csv, depth_summary.csv, ...) are skipped by their header.
+    <name>.csv exports to <name>.fbx; <scene>/poses.csv exports to <scene>.fbx.
+    Raises ValueError if two CSVs would export to the same FBX (e.g. foo.csv and foo/poses.csv).
+    """
+    csv_paths = sorted(set(csv_dir.glob("*.csv")) | set(csv_dir.glob("*/poses.csv")))
+    sources: dict[str, list[Path]] = {}
+    for csv_path in filter(_is_poses_csv, csv_paths):
+        name = csv_path.parent.name if csv_path.parent != csv_dir else csv_path.stem
+        sources.setdefault(name, []).append(csv_path)
+    clashes = {name: paths for name, paths in sources.items() if len(paths) > 1}
+    if clashes:
+        raise ValueError("several CSVs export to the same FBX: " + "; ".join(
+            f"{name}.fbx <- {', '.join(str(p) for p in paths)}" for name, paths in clashes.items()
+        ))
+    return [
+        {"poses_csv": str(paths[0]), "output_fbx": str(out_dir / f"{name}.fbx"), "fps": fps}
+        for name, paths in sources.items()
+    ]
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Export poses CSV to FBX camera animation for Unreal Engine 5 (uses Blender)."
@@ -66,12 +108,12 @@ def main() -> int:
     parser.add_argument(
         "poses_csv",
         type=Path,
-        help="Path to poses CSV (frame_id, qw, qx, qy, qz, tx, ty, tz).",
+        help="Path to poses CSV (frame_id, qw, qx, qy, qz, tx, ty, tz), or a directory of them.",
     )
     parser.add_argument(
         "output_fbx",
         type=Path,
-        help="Output FBX file path.",
+        help="Output FBX file path (output directory when poses_csv is a directory).",
     )
     parser.add_argument(
         "--fps",
@@ -104,7 +146,7 @@ def main() -> int:
 
     poses_csv = Path(args.poses_csv).resolve()
     output_fbx = Path(args.output_fbx).resolve()
-    if not poses_csv.is_file():
+    if not poses_csv.exists():
         print(f"Error: poses CSV not found: {poses_csv}")
         return 1
 
@@ -113,20 +155,33 @@ def main() -> int:
         print(f"Error: Blender script not found: {script_path}")
         return 1
 
-    cmd = [
-        blender_exe,
-        "--background",
-        "--python", str(script_path),
-        "--",
-        str(poses_csv),
-        str(output_fbx),
-        str(args.fps),
-    ]
+    cmd = [blender_exe, "--background", "--python", str(script_path), "--"]
+    manifest_path = None
+    if poses_csv.is_dir():
+        try:
+            jobs = _collect_batch(poses_csv, output_fbx, args.fps)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        if not jobs:
+            print(f"Error: no pose CSVs in {poses_csv}")
+            return 1
+        fd, manifest_path = tempfile.mkstemp(suffix=".json", prefix="fbx_jobs_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(jobs, f)
+        cmd += ["--manifest", manifest_path]
+        print(f"Running: {blender_exe} --background --python ... -- --manifest ({len(jobs)} CSVs)")
+    else:
+        cmd += [str(poses_csv), str(output_fbx), str(args.fps)]
+        print(f"Running: {blender_exe} --background --python ... -- {poses_csv} {output_fbx} {args.fps}")
     if not args.scale_to_cm:
         cmd.append("--no-scale-to-cm")
 
-    print(f"Running: {blender_exe} --background --python ... -- {poses_csv} {output_fbx} {args.fps}")
-    result = subprocess.run(cmd, cwd=str(_REPO_ROOT))
+    try:
+        result = subprocess.run(cmd, cwd=str(_REPO_ROOT))
+    finally:
+        if manifest_path is not None:
+            os.unlink(manifest_path)
     return result.returncode
 
 
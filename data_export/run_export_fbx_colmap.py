@@ -16,8 +16,8 @@
 """COLMAP → (optional transform) → FBX for UE5 camera pose/path import.
 
 Reads COLMAP images.txt (and optionally cameras.txt; points3D.txt not used for camera path),
-applies optional scale/axis flips/swaps/reverse, converts to poses CSV, then runs Blender
-to export FBX for Unreal Engine 5 CineCameraActor.
+applies optional scale/axis flips/swaps/reverse, hands the poses to Blender (as a temporary
+.npy, or as the CSV given with --csv) and exports FBX for Unreal Engine 5 CineCameraActor.
 
 Usage (from repo root):
   python -m data_export.run_export_fbx_colmap plaza_10s_colmap plaza_camera.fbx
@@ -28,6 +28,7 @@ Usage (from repo root):
 from __future__ import annotations
 
 import argparse
+import functools
 import os
 import shutil
 import subprocess
@@ -35,13 +36,16 @@ import sys
 import tempfile
 from pathlib import Path
 
+import numpy as np
+
 _SCRIPT_DIR = Path(__file__).resolve().parent
 _REPO_ROOT = _SCRIPT_DIR.parent
 _BLENDER_SCRIPT = _SCRIPT_DIR / "poses_to_fbx_blender.py"
 
 
+@functools.lru_cache(maxsize=1)
 def _find_blender() -> str | None:
-    """Return path to Blender executable, or None if not found."""
+    """Return path to Blender executable, or None if not found (looked up once per process)."""
     exe = os.environ.get("BLENDER_EXE")
     if exe and Path(exe).is_file():
         return exe
@@ -52,10 +56,12 @@ def _find_blender() -> str | None:
         program_files = os.environ.get("ProgramFiles", "C:\\Program Files")
         foundation = Path(program_files) / "Blender Foundation"
         if foundation.is_dir():
-            for sub in sorted(foundation.iterdir(), reverse=True):
-                candidate = sub / "blender.exe"
-                if candidate.is_file():
-                    return str(candidate)
+            # DirEntry.is_dir() uses the type from the directory listing, no extra stat
+            subdirs = sorted((e.path for e in os.scandir(foundation) if e.is_dir()), reverse=True)
+            for sub in subdirs:
+                candidate = os.path.join(sub, "blender.exe")
+                if os.path.isfile(candidate):
+                    return candidate
     return None
 
 
@@ -78,7 +84,7 @@ def main() -> int:
         type=Path,
         default=None,
         metavar="PATH",
-        help="Save intermediate poses CSV to this path (default: temp file, deleted after).",
+        help="Save intermediate poses CSV to this path (default: temp .npy file, deleted after).",
     )
     parser.add_argument(
         "--scale",
@@ -132,38 +138,49 @@ def main() -> int:
     output_fbx = Path(args.output_fbx).resolve()
     output_fbx.parent.mkdir(parents=True, exist_ok=True)
 
-    from data_export.trajectory_control import colmap_to_csv
+    from data_export.trajectory_control import colmap_to_csv, colmap_to_poses
 
+    transform_kwargs = dict(
+        flip_x=args.flip_x,
+        flip_y=args.flip_y,
+        flip_z=args.flip_z,
+        reverse=args.reverse,
+        swap_xy=args.swap_xy,
+        swap_yz=args.swap_yz,
+        path_scale=args.scale,
+    )
+    # Without --csv, poses go to Blender as a temporary binary .npy (no text formatting/parsing)
     use_temp = args.csv is None
     if use_temp:
-        fd, csv_path = tempfile.mkstemp(suffix=".csv", prefix="colmap_poses_")
-        csv_path = Path(csv_path)
+        fd, poses_path = tempfile.mkstemp(suffix=".npy", prefix="colmap_poses_")
+        poses_path = Path(poses_path)
         os.close(fd)
     else:
-        csv_path = Path(args.csv).resolve()
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        poses_path = Path(args.csv).resolve()
+        poses_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        n_poses = colmap_to_csv(
-            images_txt,
-            csv_path,
-            flip_x=args.flip_x,
-            flip_y=args.flip_y,
-            flip_z=args.flip_z,
-            reverse=args.reverse,
-            swap_xy=args.swap_xy,
-            swap_yz=args.swap_yz,
-            path_scale=args.scale,
-        )
-        print(f"Wrote {n_poses} poses to {csv_path}")
+        if use_temp:
+            frame_ids, qvecs, tvecs = colmap_to_poses(images_txt, **transform_kwargs)
+            np.save(poses_path, np.column_stack([frame_ids, qvecs, tvecs]))
+            n_poses = frame_ids.size
+        else:
+            n_poses = colmap_to_csv(images_txt, poses_path, **transform_kwargs)
+            print(f"Wrote {n_poses} poses to {poses_path}")
 
         blender_exe = _find_blender()
         if not blender_exe:
-            print(
-                "Blender not found. Install Blender or set BLENDER_EXE.\n"
-                "Intermediate CSV saved; you can run FBX export manually:\n"
-                f"  python -m data_export.run_export_fbx {csv_path} {output_fbx}"
-            )
+            if use_temp:
+                print(
+                    "Blender not found. Install Blender or set BLENDER_EXE.\n"
+                    "Re-run with --csv PATH to keep the transformed poses for a manual FBX export."
+                )
+            else:
+                print(
+                    "Blender not found. Install Blender or set BLENDER_EXE.\n"
+                    "Intermediate CSV saved; you can run FBX export manually:\n"
+                    f"  python -m data_export.run_export_fbx {poses_path} {output_fbx}"
+                )
             return 1
 
         script_path = _BLENDER_SCRIPT.resolve()
@@ -176,23 +193,23 @@ def main() -> int:
             "--background",
             "--python", str(script_path),
             "--",
-            str(csv_path),
+            str(poses_path),
             str(output_fbx),
             str(args.fps),
         ]
         if not args.scale_to_cm:
             cmd.append("--no-scale-to-cm")
 
-        print(f"Running Blender: ... -- {csv_path} {output_fbx} {args.fps}")
+        print(f"Running Blender: ... -- {poses_path} {output_fbx} {args.fps}")
         result = subprocess.run(cmd, cwd=str(_REPO_ROOT))
         if result.returncode != 0:
             return result.returncode
         print(f"Exported {n_poses} camera keyframes to {output_fbx}")
         return 0
     finally:
-        if use_temp and csv_path.is_file():
+        if use_temp and poses_path.is_file():
             try:
-                csv_path.unlink()
+                poses_path.unlink()
             except OSError:
                 pass
 
@@ -28,38 +28,59 @@ Use --scale-from-depth [depth_summary.csv] to apply that suggested scale in this
 from __future__ import annotations
 
 import argparse
-import csv
+import functools
+import itertools
 import sys
+import warnings
 from pathlib import Path
 from typing import Iterator
 
 import numpy as np
 
-from data_export.colmap_to_ue import qvec2rotmat, load_poses_csv, rotmat2qvec
+from data_export.colmap_to_ue import load_poses_arrays, load_poses_batched
 
 
 # Default target "scene depth" in UE (cm) when suggesting scale from depth_summary.csv
 _DEFAULT_TARGET_UE_CM = 200.0
 
+# Output file buffer for pose CSV / images.txt writes
+_WRITE_BUFFER_SIZE = 1 << 20
 
-def load_depth_summary(csv_path: Path) -> list[tuple[int, float, float, float, float]]:
-    """Load depth_summary.csv with columns frame_id, depth_min, depth_max, depth_mean, depth_median.
+# Poses transformed and written per batch when streaming
+_BATCH_SIZE = 4096
 
-    Returns list of (frame_id, depth_min, depth_max, depth_mean, depth_median) per row.
-    """
-    rows = []
+# Poses CSV row format: frame_id, qw, qx, qy, qz, tx, ty, tz
+_POSE_CSV_FMT = "%d,%.8f,%.8f,%.8f,%.8f,%.8f,%.8f,%.8f"
+
+
+# Columns of depth_summary.csv used here (see export_csv)
+_DEPTH_SUMMARY_COLUMNS = ("frame_id", "depth_min", "depth_max", "depth_mean", "depth_median")
+
+
+@functools.lru_cache(maxsize=8)
+def _load_depth_summary_cached(csv_path: str, _mtime_ns: int) -> np.ndarray:
     with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            frame_id = int(row["frame_id"])
-            depth_min = float(row["depth_min"])
-            depth_max = float(row["depth_max"])
-            depth_mean = float(row["depth_mean"])
-            depth_median = float(row["depth_median"])
-            rows.append((frame_id, depth_min, depth_max, depth_mean, depth_median))
+        header = [c.strip() for c in f.readline().strip().split(",")]
+        usecols = [header.index(c) for c in _DEPTH_SUMMARY_COLUMNS]
+        with warnings.catch_warnings():
+            # Header-only files: loadtxt warns about empty input, we return (0, 5)
+            warnings.simplefilter("ignore", UserWarning)
+            rows = np.loadtxt(f, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+    rows = rows.reshape(-1, len(_DEPTH_SUMMARY_COLUMNS))
+    rows.setflags(write=False)
     return rows
 
 
+def load_depth_summary(csv_path: Path) -> np.ndarray:
+    """Load depth_summary.csv with columns frame_id, depth_min, depth_max, depth_mean, depth_median.
+
+    Returns a read-only (N, 5) float64 array with those columns, one row per frame.
+    Parsed once per file version (cached on path and modification time).
+    """
+    csv_path = Path(csv_path).resolve()
+    return _load_depth_summary_cached(str(csv_path), csv_path.stat().st_mtime_ns)
+
+
 def suggest_scale_from_depth(
     depth_summary_path: Path,
     target_ue_cm: float = _DEFAULT_TARGET_UE_CM,
@@ -74,12 +95,10 @@ def suggest_scale_from_depth(
         (suggested_scale, mean_depth_m, median_depth_m) for reporting.
     """
     rows = load_depth_summary(depth_summary_path)
-    if not rows:
+    if not rows.shape[0]:
         raise ValueError(f"No rows in depth summary: {depth_summary_path}")
-    depth_means = [r[3] for r in rows]
-    depth_medians = [r[4] for r in rows]
-    mean_depth_m = float(np.mean(depth_means))
-    median_depth_m = float(np.median(depth_medians))
+    mean_depth_m = float(rows[:, 3].mean())
+    median_depth_m = float(np.median(rows[:, 4]))
     if mean_depth_m <= 0:
         raise ValueError(f"Mean depth must be positive, got {mean_depth_m}")
     suggested_scale = target_ue_cm / (100.0 * mean_depth_m)
@@ -92,81 +111,169 @@ _FLIP_Y = np.diag([1.0, -1.0, 1.0])
 _FLIP_Z = np.diag([1.0, 1.0, -1.0])
 _SWAP_XY = np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]], dtype=np.float64)
 _SWAP_YZ = np.array([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, 1.0, 0.0]], dtype=np.float64)
+_IDENTITY = np.eye(3)
+
+
+def _build_world_transform(
+    flip_x: bool = False,
+    flip_y: bool = False,
+    flip_z: bool = False,
+    swap_xy: bool = False,
+    swap_yz: bool = False,
+) -> np.ndarray:
+    """Compose the enabled flips/swaps into one (3, 3) world-space matrix (identity if none).
+
+    Steps apply in the order flip_x, flip_y, flip_z, swap_xy, swap_yz, i.e.
+    M = SWAP_YZ @ SWAP_XY @ FLIP_Z @ FLIP_Y @ FLIP_X (restricted to the enabled ones).
+    """
+    steps = [
+        M_step
+        for enabled, M_step in (
+            (flip_x, _FLIP_X), (flip_y, _FLIP_Y), (flip_z, _FLIP_Z),
+            (swap_xy, _SWAP_XY), (swap_yz, _SWAP_YZ),
+        )
+        if enabled
+    ]
+    return functools.reduce(lambda M, M_step: M_step @ M, steps, _IDENTITY)
+
 
+def _signed_permutation(M: np.ndarray) -> tuple[np.ndarray, np.ndarray, float]:
+    """(perm, sign, det) with M[i, perm[i]] = sign[i] for a signed permutation matrix M.
 
-def _apply_transform(
-    qvec: np.ndarray,
-    tvec: np.ndarray,
-    flip_x: bool,
-    flip_y: bool,
-    flip_z: bool,
-    swap_xy: bool,
-    swap_yz: bool,
+    Every composition of _FLIP_* / _SWAP_* is one; det is +1 or -1.
+    """
+    perm = np.argmax(np.abs(M), axis=1)
+    sign = M[np.arange(3), perm]
+    if np.count_nonzero(M) != 3 or set(perm.tolist()) != {0, 1, 2} or not np.array_equal(np.abs(sign), np.ones(3)):
+        raise ValueError(f"World transform must be a signed permutation, got {M.tolist()}")
+    return perm, sign, float(np.prod(sign) * round(np.linalg.det(np.eye(3)[perm])))
+
+
+def _apply_transform_batch(
+    qvecs: np.ndarray,
+    tvecs: np.ndarray,
+    signed_perm: tuple[np.ndarray, np.ndarray, float],
     path_scale: float,
 ) -> tuple[np.ndarray, np.ndarray]:
-    """Apply flip/swap/scale to one pose in COLMAP world space. Returns (qvec_new, tvec_new).
-    
-    For world-space transformations with matrix M:
-    - Camera center: C_new = M @ C
-    - Rotation (world-to-camera): R_new = M @ R @ M.T
-    This ensures the camera orientation is correctly transformed in the new coordinate system.
+    """Apply world transform M (see _signed_permutation) and path scale to (N, 4) qvecs and (N, 3) tvecs.
+
+    For a world-space transformation with matrix M, C_new = path_scale * M @ C and
+    R_new = M @ R @ M.T. Flips/swaps make M a signed permutation, so this acts on qvecs and
+    tvecs directly, without rotation matrices: t_new = -R_new @ C_new = path_scale * M @ t,
+    and R_new only permutes and signs the quaternion's vector part, (qw, v) -> (qw, det(M) * M @ v).
+    """
+    perm, sign, det = signed_perm
+    qvecs = np.asarray(qvecs, dtype=np.float64).reshape(-1, 4)
+    # Normalize and make qw >= 0 in one factor, as the rotmat2qvec round trip did
+    f = np.copysign(1.0 / np.sqrt(np.einsum("ij,ij->i", qvecs, qvecs)), qvecs[:, 0])
+    qvecs_new = np.empty_like(qvecs)
+    np.multiply(qvecs[:, 0], f, out=qvecs_new[:, 0])
+    np.multiply(qvecs[:, 1 + perm], (det * sign) * f[:, None], out=qvecs_new[:, 1:])
+    # 180-degree rotations (qw == 0): largest vector component positive, like rotmats2qvecs
+    half_turn = np.flatnonzero(qvecs_new[:, 0] == 0)
+    if half_turn.size:
+        v = qvecs_new[half_turn, 1:]
+        pivot = v[np.arange(half_turn.size), np.argmax(np.abs(v), axis=1)]
+        qvecs_new[half_turn] *= np.where(pivot < 0, -1.0, 1.0)[:, None]
+    tvecs_new = np.asarray(tvecs, dtype=np.float64).reshape(-1, 3)[:, perm] * (sign * path_scale)
+    return qvecs_new, tvecs_new
+
+
+def _iter_colmap_records(f) -> Iterator[tuple[str, str, str]]:
+    """Yield (pose line, name, line2) for each image entry of an open COLMAP images.txt.
+
+    Pose lines are IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID, NAME; lines with
+    fewer fields are skipped. Only NAME is split out here, the numeric columns are
+    left for a bulk parse (see _load_colmap_batches).
     """
-    R = qvec2rotmat(qvec)
-    t = np.asarray(tvec, dtype=np.float64).reshape(3)
-    # Camera center in world: C = -R^T @ t
-    C = -R.T @ t
-
-    # Apply world-space transformations: for each transformation matrix M,
-    # transform both position (C_new = M @ C) and rotation (R_new = M @ R @ M.T)
-    if flip_x:
-        C = _FLIP_X @ C
-        R = _FLIP_X @ R @ _FLIP_X.T
-    if flip_y:
-        C = _FLIP_Y @ C
-        R = _FLIP_Y @ R @ _FLIP_Y.T
-    if flip_z:
-        C = _FLIP_Z @ C
-        R = _FLIP_Z @ R @ _FLIP_Z.T
-    if swap_xy:
-        C = _SWAP_XY @ C
-        R = _SWAP_XY @ R @ _SWAP_XY.T
-    if swap_yz:
-        C = _SWAP_YZ @ C
-        R = _SWAP_YZ @ R @ _SWAP_YZ.T
-
-    # Path scale: multiply camera center (position) by path_scale
-    C = C * path_scale
-
-    # Convert back to world-to-camera: t = -R @ C
-    t_new = -R @ C
-    qvec_new = rotmat2qvec(R)
-    return qvec_new, t_new
+    lines = iter(f)
+    for line1 in lines:
+        line1 = line1.strip()
+        if not line1 or line1.startswith("#"):
+            continue
+        parts = line1.split(None, 10)
+        if len(parts) < 10:
+            continue
+        line2 = next(lines, "").rstrip("\n\r")
+        yield line1, parts[9], line2
 
 
 def load_colmap_images(images_txt: Path) -> Iterator[tuple[int, np.ndarray, np.ndarray, int, str, str]]:
     """Load poses from COLMAP images.txt. Yields (image_id, qvec, tvec, camera_id, name, line2)."""
+    for batch in _load_colmap_batches(images_txt):
+        yield from zip(*batch)
+
+
+def _count_colmap_images(images_txt: Path) -> int:
+    """Number of image entries in COLMAP images.txt (no float parsing)."""
     with open(images_txt, "r", encoding="utf-8") as f:
+        return sum(1 for _ in _iter_colmap_records(f))
+
+
+def _load_colmap_batches(
+    images_txt: Path,
+    batch_size: int = _BATCH_SIZE,
+) -> Iterator[tuple[list[int], np.ndarray, np.ndarray, list[int], list[str], list[str]]]:
+    """Load COLMAP images.txt in batches of up to batch_size images.
+
+    The numeric columns of each batch are parsed with a single np.loadtxt call.
+
+    Yields:
+        (image_ids, qvecs (B, 4), tvecs (B, 3), camera_ids, names, line2s) per batch.
+    """
+    with open(images_txt, "r", encoding="utf-8") as f:
+        records = _iter_colmap_records(f)
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                break
+            pose_lines, names, line2s = zip(*batch)
+            data = np.loadtxt(pose_lines, usecols=range(9), dtype=np.float64, comments=None, ndmin=2)
+            yield (
+                data[:, 0].astype(np.int64).tolist(),
+                data[:, 1:5],
+                data[:, 5:8],
+                data[:, 8].astype(np.int64).tolist(),
+                list(names),
+                list(line2s),
+            )
+
+
+def _iter_colmap_pose_lines(f) -> Iterator[bytes]:
+    """Yield the pose line of each image entry of COLMAP images.txt opened in binary mode.
+
+    Same entry rules as _iter_colmap_records, but the POINTS2D line is skipped undecoded.
+    """
+    lines = iter(f)
+    for line1 in lines:
+        line1 = line1.strip()
+        if not line1 or line1.startswith(b"#"):
+            continue
+        if len(line1.split(None, 9)) < 10:
+            continue
+        next(lines, None)
+        yield line1
+
+
+def _load_colmap_poses_only(
+    images_txt: Path,
+    batch_size: int = _BATCH_SIZE,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Load only the poses of COLMAP images.txt, in batches of up to batch_size images.
+
+    For callers that drop image ids, camera ids, names and POINTS2D (see colmap_to_csv).
+
+    Yields:
+        (qvecs (B, 4), tvecs (B, 3)) per batch.
+    """
+    with open(images_txt, "rb") as f:
+        pose_lines = _iter_colmap_pose_lines(f)
         while True:
-            line1 = f.readline()
-            if not line1:
+            batch = list(itertools.islice(pose_lines, batch_size))
+            if not batch:
                 break
-            line1 = line1.strip()
-            if not line1 or line1.startswith("#"):
-                continue
-            parts = line1.split()
-            if len(parts) < 10:
-                continue
-            image_id = int(parts[0])
-            qvec = np.array([float(parts[1]), float(parts[2]), float(parts[3]), float(parts[4])], dtype=np.float64)
-            tvec = np.array([float(parts[5]), float(parts[6]), float(parts[7])], dtype=np.float64)
-            camera_id = int(parts[8])
-            name = parts[9]
-            line2 = f.readline()
-            if line2 is not None:
-                line2 = line2.rstrip("\n\r")
-            else:
-                line2 = ""
-            yield image_id, qvec, tvec, camera_id, name, line2
+            data = np.loadtxt(batch, usecols=range(1, 8), dtype=np.float64, comments=None, ndmin=2)
+            yield data[:, :4], data[:, 4:]
 
 
 def transform_csv(
@@ -179,33 +286,27 @@ def transform_csv(
     swap_xy: bool = False,
     swap_yz: bool = False,
     path_scale: float = 1.0,
-) -> None:
-    """Read CSV, apply transforms, write CSV."""
-    rows = list(load_poses_csv(input_csv))
-    if not rows:
-        raise ValueError(f"No poses in {input_csv}")
-
-    out_rows = []
-    for frame_id, qvec, tvec in rows:
-        q_new, t_new = _apply_transform(
-            qvec, tvec, flip_x, flip_y, flip_z, swap_xy, swap_yz, path_scale
-        )
-        out_rows.append((frame_id, q_new, t_new))
+) -> int:
+    """Read CSV, apply transforms, write CSV. Returns the number of poses written.
 
+    Poses are streamed in batches; only reverse needs the whole trajectory in memory.
+    """
+    signed_perm = _signed_permutation(_build_world_transform(flip_x, flip_y, flip_z, swap_xy, swap_yz))
     if reverse:
-        out_rows.reverse()
-        out_rows = [(i, q, t) for i, (_, q, t) in enumerate(out_rows)]
+        frame_ids, qvecs, tvecs = load_poses_arrays(input_csv)
+        batches = iter([(np.arange(frame_ids.size), qvecs[::-1], tvecs[::-1])])
+    else:
+        batches = load_poses_batched(input_csv, _BATCH_SIZE)
+    first = next(batches, None)
+    if first is None or not first[0].size:
+        raise ValueError(f"No poses in {input_csv}")
 
     output_csv.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["frame_id", "qw", "qx", "qy", "qz", "tx", "ty", "tz"])
-        for frame_id, q, t in out_rows:
-            w.writerow([
-                frame_id,
-                f"{q[0]:.8f}", f"{q[1]:.8f}", f"{q[2]:.8f}", f"{q[3]:.8f}",
-                f"{t[0]:.8f}", f"{t[1]:.8f}", f"{t[2]:.8f}",
-            ])
+    return _write_poses_csv(
+        output_csv,
+        ((frame_ids, *_apply_transform_batch(qvecs, tvecs, signed_perm, path_scale))
+         for frame_ids, qvecs, tvecs in itertools.chain([first], batches)),
+    )
 
 
 def transform_colmap(
@@ -219,41 +320,78 @@ def transform_colmap(
     swap_yz: bool = False,
     path_scale: float = 1.0,
 ) -> None:
-    """Read COLMAP images.txt, apply transforms, write images.txt (poses only; copy cameras.txt separately)."""
-    rows = list(load_colmap_images(input_images_txt))
-    if not rows:
-        raise ValueError(f"No images in {input_images_txt}")
+    """Read COLMAP images.txt, apply transforms, write images.txt (poses only; copy cameras.txt separately).
 
-    out_rows = []
-    for image_id, qvec, tvec, camera_id, name, line2 in rows:
-        q_new, t_new = _apply_transform(
-            qvec, tvec, flip_x, flip_y, flip_z, swap_xy, swap_yz, path_scale
-        )
-        out_rows.append((image_id, q_new, t_new, camera_id, name, line2))
+    Images are streamed in batches; only reverse needs the whole file in memory.
+    """
+    num_images = _count_colmap_images(input_images_txt)
+    if not num_images:
+        raise ValueError(f"No images in {input_images_txt}")
 
+    signed_perm = _signed_permutation(_build_world_transform(flip_x, flip_y, flip_z, swap_xy, swap_yz))
+    batches = _load_colmap_batches(input_images_txt)
     if reverse:
-        out_rows.reverse()
-        out_rows = [(i + 1, q, t, cid, nm, l2) for i, (_, q, t, cid, nm, l2) in enumerate(out_rows)]
+        # Reversed path: image ids renumbered 1..N in the new order
+        cols = list(zip(*batches))
+        camera_ids, names, line2s = (list(itertools.chain.from_iterable(c))[::-1] for c in cols[3:])
+        batches = iter([(
+            list(range(1, num_images + 1)),
+            np.concatenate(cols[1])[::-1],
+            np.concatenate(cols[2])[::-1],
+            camera_ids, names, line2s,
+        )])
 
     output_images_txt.parent.mkdir(parents=True, exist_ok=True)
-    _write_colmap_images(output_images_txt, out_rows)
-    return
-
-
-def _write_colmap_images(output_images_txt: Path, out_rows: list) -> None:
-    """Write COLMAP images.txt from list of (image_id, q, t, camera_id, name, line2)."""
-    with open(output_images_txt, "w", encoding="utf-8") as f:
-        f.write("# Image list with two lines per image:\n")
-        f.write("#   IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID, NAME\n")
-        f.write("#   POINTS2D[] or empty\n")
-        f.write(f"# Number of images: {len(out_rows)}\n")
-        for image_id, q, t, camera_id, name, line2 in out_rows:
-            f.write(
-                f"{image_id} {q[0]:.8f} {q[1]:.8f} {q[2]:.8f} {q[3]:.8f} "
-                f"{t[0]:.8f} {t[1]:.8f} {t[2]:.8f} {camera_id} {name}\n"
-            )
-            f.write((line2 + "\n") if line2.strip() else "0\n")
-            f.write("\n")
+    _write_colmap_images(
+        output_images_txt,
+        num_images,
+        ((image_ids, *_apply_transform_batch(qvecs, tvecs, signed_perm, path_scale), camera_ids, names, line2s)
+         for image_ids, qvecs, tvecs, camera_ids, names, line2s in batches),
+    )
+
+
+def _format_colmap_rows(
+    image_ids: list[int],
+    qvecs: np.ndarray,
+    tvecs: np.ndarray,
+    camera_ids: list[int],
+    names: list[str],
+    line2s: list[str],
+) -> str:
+    """Format a batch of images as COLMAP images.txt entries (pose line, points line, blank line)."""
+    return "".join(
+        f"{image_id} {q[0]:.8f} {q[1]:.8f} {q[2]:.8f} {q[3]:.8f} "
+        f"{t[0]:.8f} {t[1]:.8f} {t[2]:.8f} {camera_id} {name}\n"
+        + ((line2 + "\n") if line2.strip() else "0\n")
+        + "\n"
+        for image_id, q, t, camera_id, name, line2 in zip(
+            image_ids, qvecs.tolist(), tvecs.tolist(), camera_ids, names, line2s
+        )
+    )
+
+
+def _write_colmap_images(output_images_txt: Path, num_images: int, batches) -> None:
+    """Write COLMAP images.txt from batches of (image_ids, qvecs, tvecs, camera_ids, names, line2s)."""
+    with open(output_images_txt, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(
+            "# Image list with two lines per image:\n"
+            "#   IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID, NAME\n"
+            "#   POINTS2D[] or empty\n"
+            f"# Number of images: {num_images}\n"
+        )
+        for batch in batches:
+            f.write(_format_colmap_rows(*batch))
+
+
+def _write_poses_csv(output_csv: Path, batches) -> int:
+    """Write poses CSV from batches of (frame_ids (B,), qvecs (B, 4), tvecs (B, 3)). Returns row count."""
+    n = 0
+    with open(output_csv, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write("frame_id,qw,qx,qy,qz,tx,ty,tz\n")
+        for frame_ids, qvecs, tvecs in batches:
+            np.savetxt(f, np.column_stack([frame_ids, qvecs, tvecs]), fmt=_POSE_CSV_FMT)
+            n += len(qvecs)
+    return n
 
 
 def colmap_to_csv(
@@ -270,32 +408,56 @@ def colmap_to_csv(
     """Read COLMAP images.txt, apply transforms, write poses CSV for run_export_fbx.
 
     Returns the number of poses written. Frame IDs in the CSV are 0-based consecutive.
+    Images are streamed in batches; only reverse needs every pose in memory.
     """
-    rows = list(load_colmap_images(input_images_txt))
-    if not rows:
+    signed_perm = _signed_permutation(_build_world_transform(flip_x, flip_y, flip_z, swap_xy, swap_yz))
+    batches = _load_colmap_poses_only(input_images_txt)
+    if reverse:
+        poses = list(batches)
+        batches = iter([
+            (np.concatenate([q for q, _ in poses])[::-1], np.concatenate([t for _, t in poses])[::-1])
+        ] if poses else [])
+    first = next(batches, None)
+    if first is None:
         raise ValueError(f"No images in {input_images_txt}")
 
-    out_rows = []
-    for _image_id, qvec, tvec, _camera_id, _name, _line2 in rows:
-        q_new, t_new = _apply_transform(
-            qvec, tvec, flip_x, flip_y, flip_z, swap_xy, swap_yz, path_scale
-        )
-        out_rows.append((q_new, t_new))
-
-    if reverse:
-        out_rows.reverse()
+    def _numbered():
+        start = 0
+        for qvecs, tvecs in itertools.chain([first], batches):
+            yield (np.arange(start, start + len(qvecs)), *_apply_transform_batch(qvecs, tvecs, signed_perm, path_scale))
+            start += len(qvecs)
 
     output_csv.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["frame_id", "qw", "qx", "qy", "qz", "tx", "ty", "tz"])
-        for frame_id, (q, t) in enumerate(out_rows):
-            w.writerow([
-                frame_id,
-                f"{q[0]:.8f}", f"{q[1]:.8f}", f"{q[2]:.8f}", f"{q[3]:.8f}",
-                f"{t[0]:.8f}", f"{t[1]:.8f}", f"{t[2]:.8f}",
-            ])
-    return len(out_rows)
+    return _write_poses_csv(output_csv, _numbered())
+
+
+def colmap_to_poses(
+    input_images_txt: Path,
+    flip_x: bool = False,
+    flip_y: bool = False,
+    flip_z: bool = False,
+    reverse: bool = False,
+    swap_xy: bool = False,
+    swap_yz: bool = False,
+    path_scale: float = 1.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read COLMAP images.txt and apply transforms, like colmap_to_csv but without the CSV.
+
+    Returns:
+        frame_ids: (N,) int64, 0-based consecutive.
+        qvecs: (N, 4) world-to-camera quaternions (qw, qx, qy, qz).
+        tvecs: (N, 3) world-to-camera translations.
+    """
+    batches = list(_load_colmap_poses_only(input_images_txt))
+    if not batches:
+        raise ValueError(f"No images in {input_images_txt}")
+    qvecs = np.concatenate([q for q, _ in batches])
+    tvecs = np.concatenate([t for _, t in batches])
+    if reverse:
+        qvecs, tvecs = qvecs[::-1], tvecs[::-1]
+    signed_perm = _signed_permutation(_build_world_transform(flip_x, flip_y, flip_z, swap_xy, swap_yz))
+    qvecs, tvecs = _apply_transform_batch(qvecs, tvecs, signed_perm, path_scale)
+    return np.arange(len(qvecs), dtype=np.int64), qvecs, tvecs
 
 
 def main() -> int:
@@ -409,12 +571,12 @@ def main() -> int:
             return 1
         if out.is_dir():
             out = out / "poses.csv"
-        transform_csv(
+        n_poses = transform_csv(
             inp, out,
             args.flip_x, args.flip_y, args.flip_z,
             args.reverse, args.swap_xy, args.swap_yz, scale_to_use,
         )
-        print(f"Wrote {len(list(load_poses_csv(out)))} poses to {out}")
+        print(f"Wrote {n_poses} poses to {out}")
     else:
         if inp.is_dir():
             inp = inp / "images.txt"
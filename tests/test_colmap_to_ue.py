@@ -0,0 +1,63 @@
+"""Tests for data_export.colmap_to_ue rotation helpers."""
+
+import numpy as np
+import pytest
+
+from data_export import colmap_to_ue
+
+
+def test_rotmat2qvec_half_turn():
+    # 180-degree rotation about (0, -1, 1) / sqrt(2): qw = 0, off-diagonal differences vanish
+    qvec = np.array([0.0, -np.sqrt(0.5), np.sqrt(0.5), 0.0])
+    R = colmap_to_ue.qvec2rotmat(qvec)
+    qvec_out = colmap_to_ue.rotmat2qvec(R)
+    np.testing.assert_allclose(colmap_to_ue.qvec2rotmat(qvec_out), R, atol=1e-12)
+    np.testing.assert_allclose(np.abs(qvec_out @ qvec), 1.0, atol=1e-12)
+    np.testing.assert_allclose(colmap_to_ue.rotmats2qvecs(R[None])[0] @ qvec_out, 1.0, atol=1e-12)
+
+
+def test_rotmat2qvec_round_trip():
+    rng = np.random.default_rng(0)
+    qvecs = rng.normal(size=(64, 4))
+    qvecs /= np.linalg.norm(qvecs, axis=1, keepdims=True)
+    qvecs[qvecs[:, 0] < 0] *= -1
+    for qvec in qvecs:
+        np.testing.assert_allclose(colmap_to_ue.rotmat2qvec(colmap_to_ue.qvec2rotmat(qvec)), qvec, atol=1e-12)
+
+
+def test_colmap_to_ue_axis_matches_literal_matrix():
+    # Literal remap matrix from before it was stored as _COLMAP_TO_UE_PERM / _COLMAP_TO_UE_SIGN
+    M = np.array([[0.0, 0.0, 1.0], [1.0, 0.0, 0.0], [0.0, -1.0, 0.0]])
+    np.testing.assert_array_equal(colmap_to_ue._COLMAP_TO_UE_AXIS, M)
+    rng = np.random.default_rng(0)
+    C, R = rng.normal(size=(8, 3)), rng.normal(size=(8, 3, 3))
+    C_ue, R_ue = colmap_to_ue._colmap_to_ue_axes(C, R)
+    np.testing.assert_array_equal(C_ue, C @ M.T)
+    np.testing.assert_allclose(R_ue, M @ R @ M.T, atol=1e-15)
+
+
+def test_numba_kernels_match_numpy(monkeypatch):
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    qvecs = rng.normal(size=(32, 4))
+    qvecs[:4, 0] = 0.0
+    qvecs /= np.linalg.norm(qvecs, axis=1, keepdims=True)
+    tvecs = rng.normal(size=(32, 3))
+    cam_c2w = np.tile(np.eye(4), (32, 1, 1))
+    cam_c2w[:, :3, :3] = colmap_to_ue.qvecs2rotmats(qvecs)
+    cam_c2w[:, :3, 3] = tvecs
+
+    def run():
+        positions_ue, rotations_ue = colmap_to_ue.colmap_poses_to_ue(qvecs, tvecs)
+        return (
+            positions_ue,
+            rotations_ue,
+            colmap_to_ue.rotation_matrices_to_euler_xyz_rad(rotations_ue),
+            *colmap_to_ue.c2w_to_colmap_poses(cam_c2w),
+        )
+
+    expected = run()
+    monkeypatch.setattr(colmap_to_ue, "_NUMBA_MIN_POSES", 1)
+    assert colmap_to_ue._numba_kernels(32) is not None
+    for got, want in zip(run(), expected):
+        np.testing.assert_allclose(got, want, atol=1e-9)
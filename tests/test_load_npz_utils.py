@@ -0,0 +1,48 @@
+"""Tests for data_export.load_npz_utils DROID loading."""
+
+import numpy as np
+import pytest
+
+from data_export import load_npz_utils
+
+
+def _droid_arrays():
+    rng = np.random.default_rng(0)
+    return {
+        "images": rng.integers(0, 256, size=(2, 4, 5, 3), dtype=np.uint8),
+        "depths": rng.uniform(0.5, 10.0, size=(2, 4, 5)).astype(np.float32),
+        "intrinsic": np.eye(3, dtype=np.float32),
+        "cam_c2w": np.tile(np.eye(4), (2, 1, 1)),
+    }
+
+
+@pytest.mark.parametrize("save", [np.savez, np.savez_compressed])
+def test_droid_scene_arrays_writable(tmp_path, save):
+    arrays = _droid_arrays()
+    path = tmp_path / "scene_droid.npz"
+    save(path, **arrays)
+    scene = load_npz_utils.load_droid_npz(path)
+    for key in ("images", "depths", "intrinsic", "cam_c2w"):
+        np.testing.assert_array_equal(getattr(scene, key), arrays[key])
+    scene.depths[scene.depths > 5.0] = 0
+    scene.cam_c2w[:, :3, 3] = 1.0
+    assert not (scene.depths > 5.0).any()
+    # In-place edits never reach the archive
+    with np.load(path) as z:
+        np.testing.assert_array_equal(z["depths"], arrays["depths"])
+        np.testing.assert_array_equal(z["cam_c2w"], arrays["cam_c2w"])
+
+
+def test_integer_depths_cast_to_float32(tmp_path):
+    arrays = _droid_arrays()
+    arrays["depths"] = np.full((2, 4, 5), 1500, dtype=np.uint16)
+    path = tmp_path / "scene_droid.npz"
+    np.savez(path, **arrays)
+    depths = load_npz_utils.load_droid_npz(path).depths
+    assert depths.dtype == np.float32
+    np.testing.assert_array_equal(depths, 1500.0)
+
+    np.savez(tmp_path / "00000.npz", depth=np.full((4, 5), 1500, dtype=np.uint16), fov=np.array(60.0))
+    frame = load_npz_utils.load_unidepth_npz(tmp_path / "00000.npz")
+    assert frame.depth.dtype == np.float32
+    np.testing.assert_array_equal(frame.depth, 1500.0)
@@ -0,0 +1,46 @@
+"""Tests for data_export.trajectory_control world transforms."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from data_export import colmap_to_ue, trajectory_control
+
+
+def _random_poses(n, rng):
+    qvecs = rng.normal(size=(n, 4))
+    # Half-turns (qw = 0), including ones whose largest vector component is negative
+    qvecs[: n // 4, 0] = 0.0
+    qvecs[0] = [0.0, -1.0, 1.0, 0.0]
+    qvecs[1] = [0.0, 0.0, 0.0, -1.0]
+    qvecs /= np.linalg.norm(qvecs, axis=1, keepdims=True)
+    return qvecs, rng.normal(size=(n, 3))
+
+
+@pytest.mark.parametrize("flags", list(itertools.product([False, True], repeat=5)))
+def test_apply_transform_batch_matches_matrix_path(flags):
+    rng = np.random.default_rng(0)
+    qvecs, tvecs = _random_poses(64, rng)
+    path_scale = 0.37
+    M = trajectory_control._build_world_transform(*flags)
+    qvecs_new, tvecs_new = trajectory_control._apply_transform_batch(
+        qvecs, tvecs, trajectory_control._signed_permutation(M), path_scale
+    )
+
+    # Reference: C' = s * M @ C, R' = M @ R @ M.T, t' = -R' @ C'
+    R = colmap_to_ue.qvecs2rotmats(qvecs)
+    C = -np.einsum("nji,nj->ni", R, tvecs)
+    R_ref = M @ R @ M.T
+    t_ref = -np.einsum("nij,nj->ni", R_ref, path_scale * C @ M.T)
+    q_ref = colmap_to_ue.rotmats2qvecs(R_ref)
+
+    np.testing.assert_allclose(np.abs(np.einsum("ij,ij->i", qvecs_new, q_ref)), 1.0, atol=1e-12)
+    np.testing.assert_allclose(colmap_to_ue.qvecs2rotmats(qvecs_new), R_ref, atol=1e-12)
+    np.testing.assert_allclose(tvecs_new, t_ref, atol=1e-12)
+    assert (qvecs_new[:, 0] >= 0).all()
+
+
+def test_signed_permutation_rejects_general_matrix():
+    with pytest.raises(ValueError):
+        trajectory_control._signed_permutation(np.array([[0.6, -0.8, 0.0], [0.8, 0.6, 0.0], [0.0, 0.0, 1.0]]))
@@ -2,10 +2,22 @@
 """
 Extract video frames at a given FPS and save to DAVIS/upload_frames.
 Use output with run_mono-depth_demo.sh and tools/evaluate_demo.sh.
+
+Uses ffmpeg (decode, fps selection and JPEG encode in one native pipeline) when it is
+on PATH, otherwise OpenCV. Force one with --backend.
+
+If the input is a directory, every video matching --glob under it is extracted to
+<out-dir>/<relative path without suffix>/, one process per video.
 """
 
 import argparse
+import collections
+import multiprocessing
+import os
+import shutil
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -16,6 +28,136 @@ except ImportError:
     )
 
 
+def _source_frame_index(i: int, fps: float, video_fps: float, total_frames: int) -> int:
+    """Index of the source frame shown at output frame i (sampled at fps)."""
+    if not total_frames:
+        return 0
+    return min(int(i / fps * video_fps), total_frames - 1)
+
+
+def _extract_ffmpeg(ffmpeg: str, video_path: Path, out_dir: Path, fps: float) -> int:
+    """Extract frames with ffmpeg's fps filter. Returns the number of frames written."""
+    cmd = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-nostats", "-progress", "pipe:1", "-y",
+        "-i", str(video_path),
+        "-vf", f"fps={fps}",
+        "-q:v", "2",
+        "-start_number", "0",
+        str(out_dir / "%05d.jpg"),
+    ]
+    result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, text=True)
+    # -progress prints key=value blocks; the last frame= is the total written
+    written = 0
+    for line in result.stdout.splitlines():
+        if line.startswith("frame="):
+            written = int(line.partition("=")[2])
+    return written
+
+
+def _extract_opencv(video_path: Path, out_dir: Path, fps: float, num_workers: int | None = None) -> int:
+    """Extract frames with OpenCV. Returns the number of frames written.
+
+    num_workers: JPEG encode threads (default: os.cpu_count()).
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"could not open video: {video_path}")
+
+    video_fps = cap.get(cv2.CAP_PROP_FPS)
+    if video_fps <= 0:
+        video_fps = 30.0
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    duration_sec = total_frames / video_fps if total_frames else 0
+    num_out = max(1, int(round(duration_sec * fps)))
+
+    # Decode sequentially and keep the frames the output timestamps land on, instead of
+    # seeking per output frame (each seek re-decodes from the previous keyframe).
+    # JPEG encode + write runs on a thread pool (imwrite releases the GIL) while this
+    # thread keeps decoding; OpenCV's own threading is off to avoid oversubscription.
+    cv2.setNumThreads(1)
+    num_workers = num_workers or os.cpu_count() or 1
+    pending = collections.deque()
+    written = 0
+    frame_idx = 0
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        while written < num_out:
+            if not cap.grab():
+                break
+            target_idx = _source_frame_index(written, fps, video_fps, total_frames)
+            if frame_idx == target_idx:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                # Output FPS above the source FPS repeats frames
+                while written < num_out and target_idx == frame_idx:
+                    out_path = out_dir / f"{written:05d}.jpg"
+                    pending.append(pool.submit(cv2.imwrite, str(out_path), frame))
+                    written += 1
+                    target_idx = _source_frame_index(written, fps, video_fps, total_frames)
+                # Bound the number of decoded frames waiting to be encoded
+                while len(pending) > 2 * num_workers:
+                    pending.popleft().result()
+            frame_idx += 1
+        for future in pending:
+            future.result()
+
+    cap.release()
+    return written
+
+
+def _extract(video_path: Path, out_dir: Path, fps: float, backend: str, num_workers: int | None = None) -> int:
+    """Extract one video with the chosen backend (ffmpeg falls back to OpenCV under auto).
+
+    Returns the number of frames written. Raises RuntimeError on failure.
+    """
+    ffmpeg = shutil.which("ffmpeg") if backend != "opencv" else None
+    if backend == "ffmpeg" and not ffmpeg:
+        raise RuntimeError("ffmpeg not found on PATH.")
+    if ffmpeg:
+        try:
+            return _extract_ffmpeg(ffmpeg, video_path, out_dir, fps)
+        except subprocess.CalledProcessError as e:
+            if backend == "ffmpeg":
+                raise RuntimeError(f"ffmpeg failed with exit code {e.returncode}.") from e
+            print(f"ffmpeg failed on {video_path} (exit code {e.returncode}); falling back to OpenCV.", file=sys.stderr)
+    return _extract_opencv(video_path, out_dir, fps, num_workers)
+
+
+def _extract_one(task: tuple[Path, Path, float, str]) -> tuple[Path, int | None, str | None]:
+    """Process-pool worker: extract one video. Returns (video_path, written, error).
+
+    Any exception (cv2.error, OSError, ...) is returned as the error, so one bad video
+    does not take down the rest of the batch.
+    """
+    video_path, out_dir, fps, backend = task
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        # One encode thread per process; the pool already uses every core
+        return video_path, _extract(video_path, out_dir, fps, backend, num_workers=1), None
+    except Exception as e:
+        return video_path, None, f"{type(e).__name__}: {e}"
+
+
+def _extract_many(video_dir: Path, video_paths: list[Path], out_dir: Path, fps: float, backend: str, jobs: int) -> int:
+    """Extract each video under video_dir to the same relative path (minus suffix) under out_dir.
+
+    Videos run in parallel across a process pool. Returns the exit code.
+    """
+    tasks = [(p, out_dir / p.relative_to(video_dir).with_suffix(""), fps, backend) for p in video_paths]
+    failed = 0
+    # spawn: forked children would inherit OpenCV's / FFmpeg's thread state
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(processes=min(jobs, len(tasks))) as pool:
+        for video_path, written, error in pool.imap_unordered(_extract_one, tasks):
+            if error is not None:
+                failed += 1
+                print(f"Error: {video_path}: {error}", file=sys.stderr)
+            else:
+                print(f"Wrote {written} frames from {video_path}")
+    print(f"Extracted {len(tasks) - failed}/{len(tasks)} videos into {out_dir} (target FPS={fps}).")
+    return 1 if failed else 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract video frames at given FPS into DAVIS/upload_frames."
@@ -23,7 +165,7 @@ def main():
     parser.add_argument(
         "video",
         type=Path,
-        help="Path to input video file.",
+        help="Path to input video file, or a directory of videos (see --glob).",
     )
     parser.add_argument(
         "--fps",
@@ -35,12 +177,29 @@ def main():
         "--out-dir",
         type=Path,
         default=None,
-        help="Output directory (default: ./DAVIS/upload_frames).",
+        help="Output directory (default: ./DAVIS/upload_frames). For a video directory, one subdirectory per video.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["auto", "ffmpeg", "opencv"],
+        default="auto",
+        help="Frame extraction backend: auto (ffmpeg if on PATH, else OpenCV), ffmpeg, or opencv.",
+    )
+    parser.add_argument(
+        "--glob",
+        default="*.mp4",
+        help="Pattern matched recursively when video is a directory (default: *.mp4).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Videos extracted in parallel when video is a directory (default: CPU count).",
     )
     args = parser.parse_args()
 
     video_path = args.video.resolve()
-    if not video_path.is_file():
+    if not video_path.exists():
         print(f"Error: video file not found: {video_path}", file=sys.stderr)
         sys.exit(1)
 
@@ -50,31 +209,19 @@ def main():
     out_dir = out_dir.resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    cap = cv2.VideoCapture(str(video_path))
-    if not cap.isOpened():
-        print(f"Error: could not open video: {video_path}", file=sys.stderr)
-        sys.exit(1)
-
-    video_fps = cap.get(cv2.CAP_PROP_FPS)
-    if video_fps <= 0:
-        video_fps = 30.0
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration_sec = total_frames / video_fps if total_frames else 0
-    num_out = max(1, int(round(duration_sec * args.fps)))
+    if video_path.is_dir():
+        video_paths = sorted(p for p in video_path.rglob(args.glob) if p.is_file())
+        if not video_paths:
+            print(f"Error: no videos matching {args.glob} in {video_path}", file=sys.stderr)
+            sys.exit(1)
+        return _extract_many(video_path, video_paths, out_dir, args.fps, args.backend, max(1, args.jobs))
 
-    written = 0
-    for i in range(num_out):
-        t_sec = i / args.fps
-        frame_idx = min(int(t_sec * video_fps), total_frames - 1) if total_frames else 0
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        if not ret:
-            break
-        out_path = out_dir / f"{written:05d}.jpg"
-        cv2.imwrite(str(out_path), frame)
-        written += 1
+    try:
+        written = _extract(video_path, out_dir, args.fps, args.backend)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    cap.release()
     print(f"Wrote {written} frames to {out_dir} (target FPS={args.fps}).")
     return 0
 
@@ -15,7 +15,7 @@ cd "$REPO_ROOT"
 
 if [ $# -lt 1 ]; then
   echo "Usage: $0 <video_path> [--fps FPS]"
-  echo "  video_path  Path to input video (e.g. /path/to/my_video.mp4)"
+  echo "  video_path  Path to input video (e.g. /path/to/my_video.mp4) or a directory of videos"
   echo "  --fps FPS   Target FPS for extracted frames (default: 6)"
   echo ""
   echo "Frames are written to ./DAVIS/upload_frames/"